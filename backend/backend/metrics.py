@@ -0,0 +1,167 @@
+"""
+Prometheus metrics.
+
+Request, outbound-call and cache metrics are recorded in every worker.
+With several gunicorn/daphne worker processes, set PROMETHEUS_MULTIPROC_DIR
+to an empty, writable directory (wiped between deploys) before the
+workers start; /metrics then aggregates the files all workers write.
+"""
+
+import hmac
+import os
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.mail.backends import smtp
+from django.db import DatabaseError, connection
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotFound
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by URL pattern, method and status code.",
+    ["route", "method", "status"],
+)
+REQUEST_EXCEPTIONS = Counter(
+    "http_request_exceptions_total",
+    "Unhandled exceptions raised by views.",
+    ["route", "exception"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time to produce a response, by URL pattern.",
+    ["route", "method"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+OUTBOUND_LATENCY = Histogram(
+    "outbound_request_duration_seconds",
+    "Calls to external services (razorpay, supabase, smtp).",
+    ["service", "operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+OUTBOUND_FAILURES = Counter(
+    "outbound_request_failures_total",
+    "External service calls that raised.",
+    ["service", "operation"],
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Application cache lookups by cache and result (hit/stale/miss).",
+    ["cache", "result"],
+)
+
+
+def route_name(request):
+    """URL pattern name, so label values stay bounded."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.view_name or "unnamed"
+
+
+@contextmanager
+def track_outbound(service, operation):
+    """Time a call to an external service, counting failures."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        OUTBOUND_FAILURES.labels(service, operation).inc()
+        raise
+    finally:
+        OUTBOUND_LATENCY.labels(service, operation).observe(time.perf_counter() - start)
+
+
+def record_cache_lookup(name, hit):
+    """``hit`` is a bool, or a result name such as "stale"."""
+    if isinstance(hit, bool):
+        hit = "hit" if hit else "miss"
+    CACHE_LOOKUPS.labels(name, hit).inc()
+
+
+class PrometheusMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        route = route_name(request)
+        REQUEST_LATENCY.labels(route, request.method).observe(
+            time.perf_counter() - start
+        )
+        REQUESTS.labels(route, request.method, response.status_code).inc()
+        return response
+
+    def process_exception(self, request, exception):
+        REQUEST_EXCEPTIONS.labels(route_name(request), type(exception).__name__).inc()
+
+
+class SMTPEmailBackend(smtp.EmailBackend):
+    """Django's SMTP backend, timing each send as an outbound call."""
+
+    def send_messages(self, email_messages):
+        with track_outbound("smtp", "send"):
+            return super().send_messages(email_messages)
+
+
+class DatabaseConnectionCollector:
+    """Server-side connection counts for this database, read at scrape time."""
+
+    def collect(self):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT coalesce(state, 'unknown'), count(*) FROM pg_stat_activity"
+                    " WHERE datname = current_database() GROUP BY 1"
+                )
+                states = cursor.fetchall()
+                cursor.execute("SHOW max_connections")
+                (max_connections,) = cursor.fetchone()
+        except DatabaseError:
+            return
+        gauge = GaugeMetricFamily(
+            "db_connections", "Open database connections by state.", labels=["state"]
+        )
+        for state, count in states:
+            gauge.add_metric([state], count)
+        yield gauge
+        yield GaugeMetricFamily(
+            "db_max_connections",
+            "Server connection limit.",
+            value=int(max_connections),
+        )
+
+
+_database_collector = DatabaseConnectionCollector()
+if not MULTIPROCESS:
+    REGISTRY.register(_database_collector)
+
+
+def metrics_view(request):
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token:
+        # database and connection details are not for the public
+        return HttpResponseNotFound()
+    supplied = request.headers.get("Authorization", "")
+    if not hmac.compare_digest(supplied, f"Bearer {token}"):
+        return HttpResponseForbidden()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(_database_collector)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,126 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """
+    The shape of a statement: literals and IN-list lengths removed, so the
+    same query issued for different rows compares equal.
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class QueryRecorder:
+    """connection.execute_wrapper() hook counting and timing statements."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[fingerprint(sql)] += 1
+
+    def repeated(self, threshold):
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Records query count, DB time, repeated query shapes and view time per
+    request. Logs one JSON line per request (and a warning when a query
+    shape repeats QUERY_REPEAT_THRESHOLD times or more, the usual N+1
+    signature) and, when SERVER_TIMING is on, sends a Server-Timing header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold = getattr(settings, "QUERY_REPEAT_THRESHOLD", 5)
+        self.server_timing = getattr(settings, "SERVER_TIMING", settings.DEBUG)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        end = time.perf_counter()
+
+        view_start = getattr(request, "_instrumentation_view_start", None)
+        timings = {
+            "total": (end - start) * 1000,
+            "view": (end - view_start) * 1000 if view_start else 0.0,
+            "db": recorder.duration * 1000,
+        }
+        repeated = recorder.repeated(self.threshold)
+        self.log(request, response, recorder, timings, repeated)
+        if self.server_timing:
+            response["Server-Timing"] = ", ".join(
+                [
+                    f'db;dur={timings["db"]:.1f};desc="{recorder.count} queries"',
+                    f'view;dur={timings["view"]:.1f}',
+                    f'total;dur={timings["total"]:.1f}',
+                ]
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._instrumentation_view_start = time.perf_counter()
+
+    def log(self, request, response, recorder, timings, repeated):
+        match = request.resolver_match
+        view = match.view_name if match else None
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": view,
+            "status": response.status_code,
+            "queries": recorder.count,
+            "duplicate_queries": sum(
+                count - 1 for count in recorder.shapes.values() if count > 1
+            ),
+            "db_ms": round(timings["db"], 2),
+            "view_ms": round(timings["view"], 2),
+            "total_ms": round(timings["total"], 2),
+        }
+        logger.info(json.dumps(record))
+        for shape, count in repeated:
+            logger.warning(
+                json.dumps(
+                    {
+                        "event": "repeated_query",
+                        "view": view,
+                        "path": request.path,
+                        "count": count,
+                        "sql": shape[:500],
+                    }
+                )
+            )
@@ -32,6 +32,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework.authtoken",
     "rest_framework_simplejwt",
@@ -55,6 +56,8 @@ ASGI_APPLICATION = "backend.asgi.application"
 
 
 MIDDLEWARE = [
+    "backend.metrics.PrometheusMiddleware",
+    "backend.middleware.RequestInstrumentationMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -119,6 +122,40 @@ DATABASES = {
         "PORT": env("DB_PORT", default="5432"),
     }
 }
+
+# Cache
+# Redis when REDIS_URL is set (shared by all workers, so version bumps
+# invalidate everywhere); otherwise a per-process memory cache
+REDIS_URL = env("REDIS_URL", default="")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+# seconds the category tree snapshot is kept (it is also rebuilt whenever a
+# category changes)
+CATEGORY_TREE_CACHE_TIMEOUT = env.int("CATEGORY_TREE_CACHE_TIMEOUT", default=60 * 60 * 24)
+# seconds autocomplete suggestions for a prefix are reused across keystrokes
+AUTOCOMPLETE_CACHE_TIMEOUT = env.int("AUTOCOMPLETE_CACHE_TIMEOUT", default=30)
+# seconds category facet counts are reused for the same filter state
+FACETS_CACHE_TIMEOUT = env.int("FACETS_CACHE_TIMEOUT", default=60)
+# seconds a cached catalog response may be served (entries are also retired
+# as soon as the items/categories they show change)
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", default=300)
+# stampede protection (store.cache.get_or_compute): expired entries are served
+# for CACHE_STALE_GRACE more seconds while one worker recomputes them; on a
+# cold miss other workers wait for its result, taking over the lock if it is
+# released without one or held for longer than CACHE_LOCK_TIMEOUT seconds
+CACHE_STALE_GRACE = env.int("CACHE_STALE_GRACE", default=60)
+CACHE_LOCK_TIMEOUT = env.int("CACHE_LOCK_TIMEOUT", default=10)
 try:
     anon_key_parts = env("SUPABASE_SERVICE_ROLE_KEY").split(".")
     if len(anon_key_parts) > 1:
@@ -152,6 +189,18 @@ SUPABASE_BUCKET_NAME = env("BUCKET_NAME")
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+# item images: "supabase" (BUCKET_NAME) or "django" (the default file storage,
+# MEDIA_ROOT unless STORAGES points it at S3 through django-storages)
+IMAGE_STORAGE_BACKEND = env("IMAGE_STORAGE_BACKEND", default="supabase")
+# concurrent image uploads per worker process
+IMAGE_UPLOAD_WORKERS = env.int("IMAGE_UPLOAD_WORKERS", default=4)
+# resized copies built in the background (store/images.py): WEBP or JPEG
+IMAGE_VARIANT_FORMAT = env("IMAGE_VARIANT_FORMAT", default="WEBP")
+IMAGE_VARIANT_WORKERS = env.int("IMAGE_VARIANT_WORKERS", default=2)
+# direct-to-storage uploads (store/uploads.py): session lifetime in seconds, and
+# the size limit enforced by the local stand-in (Supabase uses the bucket's own)
+IMAGE_UPLOAD_SESSION_MAX_AGE = env.int("IMAGE_UPLOAD_SESSION_MAX_AGE", default=3600)
+IMAGE_UPLOAD_MAX_BYTES = env.int("IMAGE_UPLOAD_MAX_BYTES", default=10 * 1024 * 1024)
 
 
 
@@ -201,6 +250,31 @@ SIMPLE_JWT = {
     "TOKEN_TYPE_CLAIM": "token_type",
     "UPDATE_LAST_LOGIN": True,
 }
+# Request instrumentation (backend/middleware.py)
+# a query shape repeated this many times in one request is logged as a likely N+1
+QUERY_REPEAT_THRESHOLD = env.int("QUERY_REPEAT_THRESHOLD", default=5)
+# send per-request db/view timings in a Server-Timing response header
+SERVER_TIMING = env.bool("SERVER_TIMING", default=DEBUG)
+
+# /metrics requires "Authorization: Bearer <METRICS_TOKEN>" and is not served
+# at all while it is unset
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "backend.middleware": {
+            "handlers": ["console"],
+            "level": env("REQUEST_LOG_LEVEL", default="INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -227,7 +301,8 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Email settings (configure based on your email provider)
 # Email (SMTP) configuration
 
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+# Django's SMTP backend, with send latency exported to /metrics
+EMAIL_BACKEND = "backend.metrics.SMTPEmailBackend"
 EMAIL_HOST = "smtp.gmail.com"
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
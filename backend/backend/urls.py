@@ -1,10 +1,16 @@
 
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path,include
+from backend.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('accounts.urls')),
     path('api/store/', include('store.urls')),
     path('api/payments/', include('payments.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
+# locally stored images (IMAGE_STORAGE_BACKEND="django"); no-op unless DEBUG
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,14 +1,15 @@
 
 from rest_framework import serializers
 from payments.models import Payment, PaymentGatewayLog
+from store.sparse_fields import SparseFieldsMixin
 
-class PaymentGatewayLogSerializer(serializers.ModelSerializer):
+class PaymentGatewayLogSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 	class Meta:
 		model = PaymentGatewayLog
 		fields = ['id', 'payment_id', 'gateway_response', 'timestamp']
 		read_only_fields = ['id', 'timestamp']
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 	gateway_log = PaymentGatewayLogSerializer(read_only=True)
 	gateway_log_id = serializers.PrimaryKeyRelatedField(
 		queryset=PaymentGatewayLog.objects.all(),
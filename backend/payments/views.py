@@ -4,16 +4,18 @@ from payments.serializers import PaymentSerializer, PaymentGatewayLogSerializer
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
+from store.query_planner import QueryPlannerMixin
+from backend.metrics import track_outbound
 
 
 # 1. Payment CRUD
-class PaymentListCreateAPIView(generics.ListCreateAPIView):
+class PaymentListCreateAPIView(QueryPlannerMixin, generics.ListCreateAPIView):
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
-class PaymentRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class PaymentRetrieveUpdateDestroyAPIView(QueryPlannerMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -29,13 +31,13 @@ class PaymentStatusAPIView(views.APIView):
 
 
 # 3. PaymentGatewayLog CRUD (list, create, retrieve)
-class PaymentGatewayLogListCreateAPIView(generics.ListCreateAPIView):
+class PaymentGatewayLogListCreateAPIView(QueryPlannerMixin, generics.ListCreateAPIView):
     queryset = PaymentGatewayLog.objects.all()
     serializer_class = PaymentGatewayLogSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
-class PaymentGatewayLogRetrieveAPIView(generics.RetrieveAPIView):
+class PaymentGatewayLogRetrieveAPIView(QueryPlannerMixin, generics.RetrieveAPIView):
     queryset = PaymentGatewayLog.objects.all()
     serializer_class = PaymentGatewayLogSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -77,11 +79,12 @@ class RazorpayOrderAPIView(views.APIView):
             currency = "INR"
 
             # Create Razorpay Order
-            razorpay_order = client.order.create({
-                "amount": amount,
-                "currency": currency,
-                "payment_capture": 1,  # Auto capture
-            })
+            with track_outbound("razorpay", "order.create"):
+                razorpay_order = client.order.create({
+                    "amount": amount,
+                    "currency": currency,
+                    "payment_capture": 1,  # Auto capture
+                })
 
             # Create Payment record
             from payments.models import Payment
@@ -143,7 +146,8 @@ class RazorpayVerifyAPIView(views.APIView):
                 return Response({"error": "Invalid signature."}, status=400)
 
             # Fetch payment details
-            payment_details = client.payment.fetch(razorpay_payment_id)
+            with track_outbound("razorpay", "payment.fetch"):
+                payment_details = client.payment.fetch(razorpay_payment_id)
 
             # Update Payment record
             try:
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
+from store.cache import invalidate_catalog
 from store.models import Category, Item
 
 
@@ -30,6 +31,7 @@ class CategoryAdmin(admin.ModelAdmin):
     )
     search_fields = ("name", "description", "popular_brands")
     list_filter = ("is_active", "parent")
+    list_select_related = ("parent",)
     inlines = [ItemInline, SubCategoryInline]
     readonly_fields = ("image_preview", "created_at", "get_full_path")
 
@@ -54,14 +56,19 @@ class CategoryAdmin(admin.ModelAdmin):
         ("Meta", {"fields": ("created_at",)}),
     )
 
+    def get_changelist_instance(self, request):
+        changelist = super().get_changelist_instance(request)
+        # resolve the full path of every row on the page in one query
+        full_paths = Category.get_full_paths(changelist.result_list)
+        for category in changelist.result_list:
+            category.full_path = full_paths[category.id]
+        return changelist
+
     def get_full_path(self, obj):
         """Display the full hierarchical path of the category"""
-        path = []
-        current = obj
-        while current:
-            path.insert(0, current.name)
-            current = current.parent
-        return " > ".join(path)
+        if hasattr(obj, "full_path"):
+            return obj.full_path
+        return obj.get_full_path()
 
     get_full_path.short_description = "Full Path"
 
@@ -90,7 +97,7 @@ class ItemAdmin(admin.ModelAdmin):
     list_editable = ("price", "quantity", "is_active")
     list_filter = ("category", "is_active", "manufacturer")
     search_fields = ("item_name", "manufacturer", "sku", "description")
-    readonly_fields = ("image_preview", "created_at", "updated_at")
+    readonly_fields = ("image_preview", "percent_off", "created_at", "updated_at")
 
     fieldsets = (
         (
@@ -106,7 +113,10 @@ class ItemAdmin(admin.ModelAdmin):
                 )
             },
         ),
-        ("Inventory & Pricing", {"fields": ("quantity", "price", "is_active")}),
+        (
+            "Inventory & Pricing",
+            {"fields": ("quantity", "mrp", "price", "percent_off", "is_active")},
+        ),
         ("Media", {"fields": ("image_urls", "image_preview")}),
         ("Meta", {"fields": ("created_at", "updated_at")}),
     )
@@ -122,12 +132,18 @@ class ItemAdmin(admin.ModelAdmin):
 
     image_preview.short_description = "Image preview"
 
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        invalidate_catalog()
+
     def mark_active(self, request, queryset):
         queryset.update(is_active=True)
+        invalidate_catalog()
 
     mark_active.short_description = "Mark selected items as active"
 
     def mark_inactive(self, request, queryset):
         queryset.update(is_active=False)
+        invalidate_catalog()
 
     mark_inactive.short_description = "Mark selected items as inactive"
@@ -0,0 +1,483 @@
+"""
+Bulk catalog import and price/stock updates for sellers.
+
+Rows are parsed lazily from a CSV or JSON Lines file, validated in batches
+(category and SKU checks are one query per batch, not per row) and written
+with bulk_create, so memory stays flat however long the file is. Rows that
+fail validation are reported with their line number and never block the
+rest of the file.
+"""
+
+import codecs
+import csv
+import json
+import os
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from store.cache import invalidate_catalog
+from store.images import schedule_item_variants
+from store.models import CONTENT_HASH_FIELDS, Category, Item
+
+FORMATS = ("csv", "jsonl")
+EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+BATCH_SIZE = 1000
+# CSV cells holding several values, e.g. "https://a/1.jpg|https://a/2.jpg"
+CSV_LIST_FIELDS = {"image_urls"}
+CSV_LIST_SEPARATOR = "|"
+# the report lists at most this many failing rows; the count is always exact
+MAX_REPORTED_ERRORS = 1000
+# rows accepted by one bulk price/stock update request
+MAX_UPDATE_ROWS = 10000
+UPDATE_FIELDS = ("price", "quantity")
+# columns a catalog sync rewrites for a changed row
+SYNC_FIELDS = (
+    "item_name",
+    "item_type",
+    "manufacturer",
+    "category",
+    "quantity",
+    "price",
+    "mrp",
+    "description",
+    "image_urls",
+    "image_variants",
+    "is_active",
+    "content_hash",
+    "updated_at",
+)
+
+
+class ImportFileError(Exception):
+    """
+    The file itself cannot be read (wrong format, bad header, bad encoding).
+    Raised partway through an import, ``report`` holds the counts of what
+    earlier batches already wrote.
+    """
+
+    report = None
+
+
+class ItemImportRowSerializer(serializers.Serializer):
+    """
+    One catalog row. The category is a plain id here; it is checked for a
+    whole batch at once instead of by a PrimaryKeyRelatedField per row.
+    """
+
+    sku = serializers.CharField(max_length=100)
+    item_name = serializers.CharField(max_length=200)
+    item_type = serializers.CharField(max_length=100)
+    manufacturer = serializers.CharField(max_length=200)
+    category_id = serializers.IntegerField(required=False, allow_null=True)
+    quantity = serializers.IntegerField(min_value=0)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    mrp = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=0, required=False, allow_null=True
+    )
+    description = serializers.CharField(required=False, allow_blank=True, default="")
+    image_urls = serializers.ListField(
+        child=serializers.URLField(), required=False, default=list
+    )
+    is_active = serializers.BooleanField(required=False, default=True)
+
+    def validate(self, attrs):
+        mrp, price = attrs.get("mrp"), attrs["price"]
+        if mrp is not None and mrp < price:
+            raise serializers.ValidationError(
+                {"mrp": "MRP cannot be lower than the selling price."}
+            )
+        return attrs
+
+
+def detect_format(filename, default=None):
+    fmt = EXTENSIONS.get(os.path.splitext(filename or "")[1].lower(), default)
+    if fmt is None:
+        raise ImportFileError("Unknown file type; upload a .csv or .jsonl file.")
+    return fmt
+
+
+def iter_rows(fileobj, fmt):
+    """
+    Yield ``(line, row)`` from a binary file object, one row at a time.
+    Empty CSV cells are treated as missing columns.
+    """
+    lines = codecs.iterdecode(fileobj, "utf-8-sig")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(lines)
+            if not reader.fieldnames:
+                return
+            for row in reader:
+                if None in row:
+                    yield reader.line_num, {None: "Row has more cells than the header."}
+                    continue
+                data = {}
+                for key, value in row.items():
+                    key, value = key.strip(), (value or "").strip()
+                    if not value:
+                        continue
+                    if key in CSV_LIST_FIELDS:
+                        value = [
+                            part.strip()
+                            for part in value.split(CSV_LIST_SEPARATOR)
+                            if part.strip()
+                        ]
+                    data[key] = value
+                yield reader.line_num, data
+        elif fmt == "jsonl":
+            for line_number, line in enumerate(lines, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield line_number, {None: f"Invalid JSON: {e}"}
+                    continue
+                if not isinstance(row, dict):
+                    yield line_number, {None: "Each line must be a JSON object."}
+                    continue
+                yield line_number, row
+        else:
+            raise ImportFileError(f"Unsupported format '{fmt}'; use one of {', '.join(FORMATS)}.")
+    except UnicodeDecodeError as e:
+        raise ImportFileError(f"File is not UTF-8 encoded: {e}")
+
+
+def batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ItemImporter:
+    """
+    Validates and writes rows for one seller. Category ids and SKUs seen in
+    earlier batches are remembered, so each batch only asks the database
+    about values it has not seen yet.
+
+    By default every row must be a new SKU. With ``sync`` the file is the
+    seller's full catalog: new SKUs are inserted, rows whose content hash
+    differs from the stored item are updated, identical rows are left
+    alone, and the seller's active items missing from the file are
+    deactivated once the whole file has been read.
+    """
+
+    def __init__(self, seller, batch_size=BATCH_SIZE, dry_run=False, sync=False):
+        self.seller = seller
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.sync = sync
+        self.row_serializer = ItemImportRowSerializer()
+        self.categories = {}  # id -> exists
+        self.seen_skus = set()
+        # every SKU named in the feed, valid or not, is kept active
+        self.feed_skus = set()
+        self.report = {"rows": 0, "created": 0, "failed": 0, "errors": []}
+        if sync:
+            self.report.update(updated=0, unchanged=0, deactivated=0)
+
+    def run(self, rows):
+        try:
+            for batch in batched(rows, self.batch_size):
+                self.import_batch(batch)
+            if self.sync:
+                self.deactivate_missing()
+        except ImportFileError as e:
+            # earlier batches are committed; say so instead of losing the counts
+            self.report["errors"].sort(key=lambda error: error["line"])
+            e.report = self.report
+            raise
+        finally:
+            if not self.dry_run:
+                # bulk writes skip the Item signals that retire cached responses
+                invalidate_catalog()
+        self.report["errors"].sort(key=lambda error: error["line"])
+        return self.report
+
+    def add_error(self, line, errors, sku=None):
+        self.report["failed"] += 1
+        if len(self.report["errors"]) < MAX_REPORTED_ERRORS:
+            self.report["errors"].append({"line": line, "sku": sku, "errors": errors})
+
+    def validate_batch(self, batch):
+        """Field validation per row, then set-wise category and duplicate checks."""
+        valid = []
+        for line, row in batch:
+            self.report["rows"] += 1
+            if None in row:
+                self.add_error(line, {"non_field_errors": [row[None]]})
+                continue
+            if isinstance(row.get("sku"), str):
+                self.feed_skus.add(row["sku"].strip())
+            try:
+                data = self.row_serializer.run_validation(row)
+            except serializers.ValidationError as e:
+                self.add_error(line, e.detail, sku=row.get("sku"))
+                continue
+            # JSONL SKUs may be numbers, which only validation turns into str
+            self.feed_skus.add(data["sku"])
+            valid.append((line, data))
+
+        unknown = {
+            data["category_id"]
+            for _, data in valid
+            if data.get("category_id") is not None
+            and data["category_id"] not in self.categories
+        }
+        if unknown:
+            found = set(
+                Category.objects.filter(pk__in=unknown).values_list("pk", flat=True)
+            )
+            self.categories.update({pk: pk in found for pk in unknown})
+
+        accepted = []
+        for line, data in valid:
+            sku, category_id = data["sku"], data.get("category_id")
+            if category_id is not None and not self.categories[category_id]:
+                self.add_error(line, {"category_id": [f"Category {category_id} does not exist."]}, sku)
+            elif sku in self.seen_skus:
+                self.add_error(line, {"sku": ["Duplicate SKU earlier in this file."]}, sku)
+            else:
+                self.seen_skus.add(sku)
+                accepted.append((line, data))
+        return accepted
+
+    def build(self, data):
+        item = Item(seller=self.seller, **data)
+        # bulk_create()/bulk_update() skip Item.save()
+        item.content_hash = item.compute_content_hash()
+        return item
+
+    def import_batch(self, batch):
+        accepted = self.validate_batch(batch)
+        if not accepted:
+            return
+        existing = {
+            row["sku"]: row
+            for row in Item.objects.filter(
+                sku__in=[data["sku"] for _, data in accepted]
+            ).values(
+                "id",
+                "sku",
+                "seller_id",
+                "content_hash",
+                "is_active",
+                "image_urls",
+                "image_variants",
+            )
+        }
+        new, updates = [], []
+        for line, data in accepted:
+            current = existing.get(data["sku"])
+            if current is None:
+                new.append((line, data))
+            elif not self.sync or current["seller_id"] != self.seller.pk:
+                self.add_error(line, {"sku": ["An item with this SKU already exists."]}, data["sku"])
+            else:
+                item = self.build(data)
+                if (
+                    item.content_hash == current["content_hash"]
+                    and item.is_active == current["is_active"]
+                ):
+                    self.report["unchanged"] += 1
+                else:
+                    item.pk = current["id"]
+                    # variants follow image_urls by position: keep them only
+                    # while the list is unchanged
+                    if item.image_urls == (current["image_urls"] or []):
+                        item.image_variants = current["image_variants"]
+                    updates.append(item)
+        self.create(new)
+        self.update(updates)
+
+    def create(self, accepted):
+        if not accepted or self.dry_run:
+            self.report["created"] += len(accepted)
+            return
+        items = [self.build(data) for _, data in accepted]
+        try:
+            with transaction.atomic():
+                Item.objects.bulk_create(items)
+        except IntegrityError:
+            # another writer took some of these SKUs since validation
+            self.retry_conflicts(accepted)
+            return
+        self.report["created"] += len(items)
+
+    def retry_conflicts(self, accepted):
+        taken = set(
+            Item.objects.filter(sku__in=[data["sku"] for _, data in accepted]).values_list(
+                "sku", flat=True
+            )
+        )
+        remaining = []
+        for line, data in accepted:
+            if data["sku"] in taken:
+                self.add_error(line, {"sku": ["An item with this SKU already exists."]}, data["sku"])
+            else:
+                remaining.append((line, data))
+        try:
+            with transaction.atomic():
+                Item.objects.bulk_create([self.build(data) for _, data in remaining])
+        except IntegrityError:
+            # still racing another writer: settle the rest row by row
+            for line, data in remaining:
+                try:
+                    with transaction.atomic():
+                        Item.objects.bulk_create([self.build(data)])
+                except IntegrityError:
+                    self.add_error(line, {"sku": ["An item with this SKU already exists."]}, data["sku"])
+                else:
+                    self.report["created"] += 1
+            return
+        self.report["created"] += len(remaining)
+
+    def update(self, items):
+        if not items:
+            return
+        self.report["updated"] += len(items)
+        if self.dry_run:
+            return
+        now = timezone.now()
+        for item in items:
+            item.updated_at = now
+        Item.objects.bulk_update(items, SYNC_FIELDS)
+        for item in items:
+            if item.image_urls and not item.image_variants:
+                schedule_item_variants(item.pk)
+
+    def deactivate_missing(self):
+        if not self.report["rows"]:
+            # an empty feed is far more likely a broken export than an empty shop
+            return
+        stale = [
+            pk
+            for pk, sku in Item.objects.filter(seller=self.seller, is_active=True)
+            .values_list("id", "sku")
+            .iterator(chunk_size=5000)
+            if sku not in self.feed_skus
+        ]
+        self.report["deactivated"] = len(stale)
+        if self.dry_run:
+            return
+        now = timezone.now()
+        for chunk in batched(stale, self.batch_size):
+            # is_active is not part of content_hash, so the hashes stay valid
+            Item.objects.filter(pk__in=chunk).update(is_active=False, updated_at=now)
+
+
+def import_items(seller, fileobj, fmt, batch_size=BATCH_SIZE, dry_run=False, sync=False):
+    """
+    Import a seller's catalog from a binary CSV/JSONL file object and return
+    ``{"rows", "created", "failed", "errors": [{"line", "sku", "errors"}]}``,
+    plus ``updated``/``unchanged``/``deactivated`` with ``sync`` (see
+    ItemImporter). With ``dry_run`` nothing is written; the counts say what
+    would have been.
+    """
+    importer = ItemImporter(seller, batch_size=batch_size, dry_run=dry_run, sync=sync)
+    return importer.run(iter_rows(fileobj, fmt))
+
+
+class ItemUpdateRowSerializer(serializers.Serializer):
+    """One price/stock change, addressed by item id or SKU."""
+
+    id = serializers.IntegerField(required=False)
+    sku = serializers.CharField(max_length=100, required=False)
+    price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=0, required=False
+    )
+    quantity = serializers.IntegerField(min_value=0, required=False)
+
+    def validate(self, attrs):
+        if ("id" in attrs) == ("sku" in attrs):
+            raise serializers.ValidationError("Give exactly one of id or sku.")
+        if not any(field in attrs for field in UPDATE_FIELDS):
+            raise serializers.ValidationError("Nothing to update; give price and/or quantity.")
+        return attrs
+
+
+def bulk_update_items(seller, rows):
+    """
+    Apply ``[{"id" | "sku", "price"?, "quantity"?}]`` to the seller's items:
+    one query loads every addressed item the seller owns, one bulk_update
+    writes the changed ones. Rows are reported by their index in ``rows``;
+    an item that does not exist and one owned by another seller look the
+    same. Returns ``{"rows", "updated", "unchanged", "failed", "errors"}``.
+    """
+    report = {"rows": len(rows), "updated": 0, "unchanged": 0, "failed": 0, "errors": []}
+
+    def add_error(index, errors):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": index, "errors": errors})
+
+    row_serializer = ItemUpdateRowSerializer()
+    valid = []
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, row_serializer.run_validation(row)))
+        except serializers.ValidationError as e:
+            add_error(index, e.detail)
+    if not valid:
+        return report
+
+    ids = {data["id"] for _, data in valid if "id" in data}
+    skus = {data["sku"] for _, data in valid if "sku" in data}
+    with transaction.atomic():
+        # locked (in id order, so concurrent requests cannot deadlock) until
+        # the write, so content_hash is computed from current sibling fields
+        owned = (
+            Item.objects.filter(seller=seller)
+            .filter(Q(id__in=ids) | Q(sku__in=skus))
+            .only("id", "sku", *CONTENT_HASH_FIELDS)
+            .order_by("id")
+            .select_for_update()
+        )
+        by_id, by_sku = {}, {}
+        for item in owned:
+            by_id[item.id] = by_sku[item.sku] = item
+
+        changed, seen = {}, set()
+        for index, data in valid:
+            item = by_id.get(data["id"]) if "id" in data else by_sku.get(data["sku"])
+            if item is None:
+                add_error(index, {"non_field_errors": ["Item not found."]})
+                continue
+            if item.id in seen:
+                add_error(index, {"non_field_errors": ["Item appears more than once."]})
+                continue
+            seen.add(item.id)
+            price = data.get("price", item.price)
+            if item.mrp is not None and item.mrp < price:
+                add_error(index, {"price": ["Price cannot be higher than the MRP."]})
+                continue
+            quantity = data.get("quantity", item.quantity)
+            if price == item.price and quantity == item.quantity:
+                report["unchanged"] += 1
+                continue
+            item.price, item.quantity = price, quantity
+            item.content_hash = item.compute_content_hash()
+            changed[item.id] = item
+
+        if changed:
+            # bulk_update() does not run auto_now
+            now = timezone.now()
+            for item in changed.values():
+                item.updated_at = now
+            Item.objects.bulk_update(
+                changed.values(),
+                [*UPDATE_FIELDS, "content_hash", "updated_at"],
+                batch_size=BATCH_SIZE,
+            )
+            invalidate_catalog()
+    report["updated"] = len(changed)
+    report["errors"].sort(key=lambda error: error["row"])
+    return report
@@ -0,0 +1,299 @@
+import hashlib
+import math
+import random
+import secrets
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+
+from backend.metrics import record_cache_lookup
+from store.models import Category
+
+VERSION_KEY_PREFIX = "store:version:"
+
+CATEGORY_TREE_VERSION = "category-tree"
+# any item's listing data; bumped by every Item save and Item.delete()
+ITEMS_VERSION = "items"
+# bumped by bulk writes that bypass Item.save() and Item.delete() (imports,
+# bulk updates, admin actions, cascading deletes); part of every cached
+# response key
+CATALOG_VERSION = "catalog"
+
+
+def item_version(pk):
+    return f"item:{pk}"
+
+
+def category_items_version(pk):
+    """Items listed under category ``pk``, including its subcategories."""
+    return f"category-items:{pk}"
+
+
+# XFetch: > 1 favours earlier refreshes, < 1 later ones
+XFETCH_BETA = 1.0
+LOCK_POLL_INTERVAL = 0.025
+
+
+def _version_key(name):
+    return f"{VERSION_KEY_PREFIX}{name}"
+
+
+def _seed_version(key):
+    # seed from the clock so an evicted counter never reuses an old version
+    cache.add(key, int(time.time() * 1000), timeout=None)
+
+
+def get_version(name):
+    """Current value of a named version counter, creating it on first use."""
+    key = _version_key(name)
+    version = cache.get(key)
+    if version is None:
+        _seed_version(key)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(names):
+    """Map each of ``names`` to its version counter in one cache round trip."""
+    keys = {name: _version_key(name) for name in names}
+    found = cache.get_many(keys.values())
+    versions = {}
+    for name, key in keys.items():
+        if key not in found:
+            _seed_version(key)
+            found[key] = cache.get(key)
+        versions[name] = found[key]
+    return versions
+
+
+def bump_version(name):
+    """Invalidate everything cached under the given version counter."""
+    key = _version_key(name)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        _seed_version(key)
+        return cache.incr(key)
+
+
+def get_or_compute(key, compute, timeout, name=None):
+    """
+    Return the value cached under ``key``, calling ``compute()`` to fill it
+    such that only one worker at a time recomputes a given key:
+
+    - Entries stay in the cache for CACHE_STALE_GRACE seconds past
+      ``timeout``. While one worker recomputes an expired entry (holding a
+      lock taken with cache.add), the others keep serving the stale value.
+    - Entries are refreshed early with a probability that grows as expiry
+      nears and with how long ``compute()`` took ("XFetch"), so hot keys
+      are usually rebuilt before they expire at all.
+    - On a plain miss, workers that lose the lock poll for the winner's
+      value; if the lock is released without one (or expires after
+      CACHE_LOCK_TIMEOUT), the next of them to take it computes instead.
+
+    A ``compute()`` result of None is returned but not cached; a
+    ``timeout`` of 0 disables caching. ``name`` labels the lookup metrics.
+    """
+    if timeout == 0:
+        return compute()
+    entry = cache.get(key)
+    now = time.time()
+    if entry is not None:
+        # -log(u) is exponentially distributed: usually small, occasionally
+        # large enough to refresh a still-fresh entry
+        early = entry["delta"] * XFETCH_BETA * -math.log(1 - random.random())
+        if now + early < entry["expires"]:
+            _record(name, "hit")
+            return entry["value"]
+        token = _acquire(key)
+        if token is None:
+            _record(name, "stale")
+            return entry["value"]
+    else:
+        entry, token = _wait_for(key)
+        if entry is not None:
+            _record(name, "hit")
+            return entry["value"]
+
+    _record(name, "miss")
+    try:
+        return _compute_and_store(key, compute, timeout)
+    finally:
+        _release(key, token)
+
+
+def _lock_key(key):
+    return f"{key}:lock"
+
+
+def _acquire(key):
+    """A token for the lock on ``key``, or None if another worker holds it."""
+    token = secrets.token_hex(8)
+    if cache.add(
+        _lock_key(key), token, timeout=getattr(settings, "CACHE_LOCK_TIMEOUT", 10)
+    ):
+        return token
+    return None
+
+
+def _release(key, token):
+    # once CACHE_LOCK_TIMEOUT has passed the lock may be another worker's
+    lock_key = _lock_key(key)
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def _wait_for(key):
+    """
+    ``(entry, None)`` once another worker has cached ``key``, or
+    ``(None, token)`` once this one holds its lock.
+    """
+    token = _acquire(key)
+    while token is None:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry, None
+        token = _acquire(key)
+    return None, token
+
+
+def _compute_and_store(key, compute, timeout):
+    start = time.time()
+    value = compute()
+    end = time.time()
+    if value is not None:
+        grace = getattr(settings, "CACHE_STALE_GRACE", 60)
+        cache.set(
+            key,
+            {"value": value, "expires": end + timeout, "delta": end - start},
+            timeout + grace,
+        )
+    return value
+
+
+def _record(name, result):
+    if name is not None:
+        record_cache_lookup(name, result)
+
+
+def category_paths():
+    """Map category id to its materialized path, cached per category tree version."""
+    return get_or_compute(
+        f"store:category-paths:{get_version(CATEGORY_TREE_VERSION)}",
+        lambda: dict(Category.objects.values_list("id", "path")),
+        getattr(settings, "CATEGORY_TREE_CACHE_TIMEOUT", 60 * 60 * 24),
+    )
+
+
+def invalidate_item(pk, *category_ids):
+    """
+    Bump the versions of an item's detail response and of every listing it
+    appears in: all items, and each given category with its ancestors.
+
+    Runs once the current transaction commits, so a concurrent request
+    cannot cache the old rows under the new versions.
+    """
+    transaction.on_commit(lambda: _invalidate_item(pk, category_ids))
+
+
+def _invalidate_item(pk, category_ids):
+    names = {item_version(pk), ITEMS_VERSION}
+    category_ids = {category_id for category_id in category_ids if category_id}
+    if category_ids:
+        paths = category_paths()
+        for category_id in category_ids:
+            path = paths.get(category_id, f"/{category_id}/")
+            names.update(
+                category_items_version(ancestor)
+                for ancestor in path.strip("/").split("/")
+                if ancestor
+            )
+    for name in names:
+        bump_version(name)
+
+
+def invalidate_catalog():
+    """Retire every cached response once the current transaction commits."""
+    transaction.on_commit(lambda: bump_version(CATALOG_VERSION))
+
+
+class ResponseCacheMixin:
+    """
+    Read-through cache for the rendered body of successful list/retrieve
+    responses.
+
+    Keys combine the host, path, sorted query string and negotiated format
+    with the versions named by get_cache_versions() (plus CATALOG_VERSION),
+    so bumping any of those counters retires the entry; nothing is deleted.
+    Authentication and permission checks still run on every request, so
+    cached views must render the same body for every user allowed to see
+    it. The browsable API is never cached.
+    """
+
+    def get_cache_versions(self):
+        return []
+
+    def get_cache_version_token(self):
+        names = [CATALOG_VERSION, *self.get_cache_versions()]
+        versions = get_versions(names)
+        return ".".join(str(versions[name]) for name in names)
+
+    def get_response_cache_key(self, request):
+        query = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            for value in values
+        )
+        raw = "|".join(
+            [
+                request.get_host(),
+                request.path,
+                urlencode(query),
+                request.accepted_renderer.format,
+                self.get_cache_version_token(),
+            ]
+        )
+        digest = hashlib.sha1(raw.encode()).hexdigest()
+        return f"store:response:{type(self).__name__}:{digest}"
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if request.accepted_renderer.format != "json":
+            return handler(request, *args, **kwargs)
+        computed = []
+
+        def render():
+            response = handler(request, *args, **kwargs)
+            computed.append(response)
+            if response.status_code != 200:
+                return None
+            # what finalize_response() would do, so the body can be cached now
+            response.accepted_renderer = request.accepted_renderer
+            response.accepted_media_type = request.accepted_media_type
+            response.renderer_context = self.get_renderer_context()
+            response.render()
+            return {"content": response.content, "content_type": response["Content-Type"]}
+
+        entry = get_or_compute(
+            self.get_response_cache_key(request),
+            render,
+            getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300),
+            name="response",
+        )
+        if computed:
+            response = computed[0]
+            response["X-Cache"] = "MISS"
+        else:
+            response = HttpResponse(entry["content"], content_type=entry["content_type"])
+            response["X-Cache"] = "HIT"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,57 @@
+import hashlib
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from store.cache import CATEGORY_TREE_VERSION, get_or_compute, get_version
+from store.models import Category
+from store.serializers import CategoryNodeSerializer
+
+# same cut-off as RecursiveField, so the snapshot matches CategorySerializer
+MAX_DEPTH = 5
+
+
+def build_category_tree():
+    """
+    Serialize every active category with its nested subcategories from a
+    single query, in the same shape CategorySerializer produces.
+    """
+    categories = Category.objects.order_by("id")
+    nodes = {}
+    children = defaultdict(list)
+    for category in categories:
+        nodes[category.id] = CategoryNodeSerializer(category).data
+        if category.parent_id:
+            children[category.parent_id].append(category.id)
+
+    def render(pk, depth):
+        data = dict(nodes[pk])
+        data["subcategories"] = [
+            None if depth > MAX_DEPTH else render(child, depth + 1)
+            for child in children[pk]
+        ]
+        return data
+
+    return [render(pk, 1) for pk, node in nodes.items() if node["is_active"]]
+
+
+def get_category_tree():
+    """
+    Return the cached ``{"etag": ..., "data": [...]}`` snapshot, rebuilding it
+    when the category tree version has been bumped.
+    """
+    key = f"store:category-tree:{get_version(CATEGORY_TREE_VERSION)}"
+    return get_or_compute(
+        key,
+        build_category_snapshot,
+        getattr(settings, "CATEGORY_TREE_CACHE_TIMEOUT", 60 * 60 * 24),
+        name="category-tree",
+    )
+
+
+def build_category_snapshot():
+    data = build_category_tree()
+    payload = json.dumps(data, cls=JSONEncoder, sort_keys=True).encode()
+    return {"etag": f'"{hashlib.sha1(payload).hexdigest()}"', "data": data}
@@ -0,0 +1,233 @@
+"""
+Streaming CSV/NDJSON exports.
+
+Rows are read through a server-side cursor (QuerySet.iterator) and written
+to the response a chunk at a time, so memory use does not grow with the
+number of rows exported (under ASGI the chunks are handed over through an
+async iterator). Item exports use the same columns (and "|" separated
+image URLs) as store.bulk imports, so a catalog can be exported, edited
+and re-imported with sync.
+"""
+
+import csv
+import io
+import json
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import CharField, Q, Value
+from django.db.models.functions import Cast, Concat
+from django.http import StreamingHttpResponse
+
+from payments.models import Payment
+from store.bulk import CSV_LIST_SEPARATOR
+from store.models import Item, Order
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+# rows written per chunk handed to the WSGI server
+FLUSH_ROWS = 500
+
+
+class Export(ABC):
+    """A named dataset: the queryset a user may export and its columns."""
+
+    name = None
+    # (header, values_list lookup or annotation name)
+    columns = []
+
+    @abstractmethod
+    def get_queryset(self, user):
+        """Rows visible to ``user``, or None when they may not export this."""
+
+    def rows(self, user):
+        queryset = self.get_queryset(user)
+        if queryset is None:
+            return None
+        chunk_size = getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+        return (
+            queryset.order_by("pk")
+            .values_list(*[lookup for _, lookup in self.columns])
+            .iterator(chunk_size=chunk_size)
+        )
+
+
+class ItemExport(Export):
+    name = "items"
+    columns = [
+        ("id", "id"),
+        ("sku", "sku"),
+        ("item_name", "item_name"),
+        ("item_type", "item_type"),
+        ("manufacturer", "manufacturer"),
+        ("category_id", "category_id"),
+        ("category_name", "category__name"),
+        ("quantity", "quantity"),
+        ("price", "price"),
+        ("mrp", "mrp"),
+        ("description", "description"),
+        ("image_urls", "image_urls"),
+        ("is_active", "is_active"),
+        ("created_at", "created_at"),
+        ("updated_at", "updated_at"),
+    ]
+
+    def get_queryset(self, user):
+        if user.is_staff:
+            return Item.objects.all()
+        if hasattr(user, "seller"):
+            return Item.objects.filter(seller=user.seller)
+        return None
+
+
+class OrderExport(Export):
+    """
+    One row per order; its lines are folded into a single "items" column by
+    Postgres (``name x quantity @ price; ...``). Sellers get their orders
+    with only their own lines.
+    """
+
+    name = "orders"
+    columns = [
+        ("id", "id"),
+        ("status", "status"),
+        ("buyer_email", "buyer_email"),
+        ("total_amount", "total_amount"),
+        ("city", "order_user__city"),
+        ("pincode", "order_user__pincode"),
+        ("items", "items"),
+        ("tracking_number", "tracking_number"),
+        ("created_at", "created_at"),
+        ("shipped_at", "shipped_at"),
+        ("delivered_at", "delivered_at"),
+    ]
+
+    def get_queryset(self, user):
+        if user.is_staff:
+            orders = Order.objects.all()
+        elif hasattr(user, "seller"):
+            # the aggregate below reuses this join, so it only sees the
+            # seller's lines and each order comes out once
+            orders = Order.objects.filter(order_items__seller=user.seller)
+        else:
+            orders = Order.objects.filter(order_user__user=user)
+        line = Concat(
+            "order_items__item_name",
+            Value(" x "),
+            Cast("order_items__quantity", CharField()),
+            Value(" @ "),
+            Cast("order_items__price", CharField()),
+            output_field=CharField(),
+        )
+        return orders.annotate(
+            items=StringAgg(
+                line,
+                delimiter="; ",
+                order_by="order_items__id",
+                filter=Q(order_items__isnull=False),
+            )
+        )
+
+
+class PaymentExport(Export):
+    name = "payments"
+    columns = [
+        ("id", "id"),
+        ("transaction_id", "transaction_id"),
+        ("order_id", "order_id"),
+        ("user_email", "user__email"),
+        ("seller_id", "seller_id"),
+        ("amount", "amount"),
+        ("currency", "currency"),
+        ("status", "status"),
+        ("is_success", "is_success"),
+        ("created_at", "created_at"),
+        ("updated_at", "updated_at"),
+    ]
+
+    def get_queryset(self, user):
+        if user.is_staff:
+            return Payment.objects.all()
+        if hasattr(user, "seller"):
+            return Payment.objects.filter(seller=user.seller)
+        return Payment.objects.filter(user=user)
+
+
+EXPORTS = {export.name: export for export in (ItemExport(), OrderExport(), PaymentExport())}
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return CSV_LIST_SEPARATOR.join(str(part) for part in value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def stream_csv(headers, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([_csv_value(value) for value in row])
+        if count % FLUSH_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_ndjson(headers, rows):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(headers, row)), cls=DjangoJSONEncoder))
+        if len(lines) == FLUSH_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+async def aiter_chunks(chunks):
+    """
+    Async view of a sync chunk generator, for ASGI servers (which would
+    otherwise collect a sync iterator into a list before sending a byte).
+    Chunks are produced one at a time on the request's sync thread, where
+    the server-side cursor behind them lives.
+    """
+    chunks = iter(chunks)
+    next_chunk = sync_to_async(lambda: next(chunks, None), thread_sensitive=True)
+    try:
+        while (chunk := await next_chunk()) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close, thread_sensitive=True)()
+
+
+def export_response(export, user, file_format, asynchronous=False):
+    """
+    StreamingHttpResponse for ``export`` as seen by ``user``, or None when
+    the user may not export it. ``asynchronous`` streams through an async
+    iterator, which is what keeps memory flat under ASGI.
+    """
+    rows = export.rows(user)
+    if rows is None:
+        return None
+    headers = [header for header, _ in export.columns]
+    stream = stream_csv if file_format == "csv" else stream_ndjson
+    content = stream(headers, rows)
+    if asynchronous:
+        content = aiter_chunks(content)
+    response = StreamingHttpResponse(content, content_type=FORMATS[file_format])
+    response["Content-Disposition"] = (
+        f'attachment; filename="{export.name}.{file_format}"'
+    )
+    return response
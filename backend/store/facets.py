@@ -0,0 +1,67 @@
+import hashlib
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.db.models import Case, Count, IntegerField, Value, When
+
+# (min, max) price ranges shown in the sidebar; max is exclusive, None is open
+PRICE_BUCKETS = [(0, 50), (50, 100), (100, 200), (200, 500), (500, None)]
+
+# query params that do not change which items match
+NON_FILTER_PARAMS = {"page", "page_size", "sort", "facets", "cursor"}
+
+
+def _price_bucket():
+    whens = []
+    for index, (low, high) in enumerate(PRICE_BUCKETS):
+        condition = {"price__gte": low}
+        if high is not None:
+            condition["price__lt"] = high
+        whens.append(When(then=Value(index), **condition))
+    return Case(*whens, output_field=IntegerField())
+
+
+def compute_facets(queryset):
+    """
+    Counts per manufacturer, item type and price bucket for the items in
+    ``queryset``, from a single grouped query rolled up in Python.
+    """
+    rows = (
+        queryset.order_by()
+        .annotate(price_bucket=_price_bucket())
+        .values("manufacturer", "item_type", "price_bucket")
+        .annotate(count=Count("id"))
+    )
+    manufacturers, item_types, buckets = Counter(), Counter(), Counter()
+    for row in rows:
+        manufacturers[row["manufacturer"]] += row["count"]
+        item_types[row["item_type"]] += row["count"]
+        buckets[row["price_bucket"]] += row["count"]
+
+    def ranked(counter):
+        return [
+            {"value": value, "count": count}
+            for value, count in sorted(counter.items(), key=lambda kv: (-kv[1], kv[0]))
+        ]
+
+    return {
+        "manufacturer": ranked(manufacturers),
+        "item_type": ranked(item_types),
+        "price": [
+            {"min": low, "max": high, "count": buckets[index]}
+            for index, (low, high) in enumerate(PRICE_BUCKETS)
+        ],
+    }
+
+
+def facets_cache_key(prefix, query_params):
+    """Cache key for a normalized (sorted, non-empty, filter-only) param set."""
+    normalized = sorted(
+        (key, value)
+        for key, values in query_params.lists()
+        if key not in NON_FILTER_PARAMS
+        for value in values
+        if value != ""
+    )
+    digest = hashlib.sha1(urlencode(normalized).encode()).hexdigest()
+    return f"store:facets:{prefix}:{digest}"
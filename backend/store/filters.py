@@ -0,0 +1,47 @@
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+from store.search import search_items
+
+# ?sort= values understood by the item listings
+ITEM_SORTS = {
+    "price_asc": ("price",),
+    "price_desc": ("-price",),
+    # stored, indexed discount columns
+    "saving_desc": ("-saving_amount",),
+    "saving_asc": ("saving_amount",),
+    "percent_off_desc": ("-percent_off",),
+    # seller dashboard orderings
+    "stock_asc": ("quantity",),
+    "updated_desc": ("-updated_at",),
+}
+
+
+class ItemSearchFilter(BaseFilterBackend):
+    """Full-text search over items using the ``search`` query param."""
+
+    search_param = api_settings.SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, "").strip()
+        if not term:
+            return queryset
+        return search_items(queryset, term)
+
+
+class ItemSortFilter(BaseFilterBackend):
+    """
+    Order items by the ``sort`` query param. ``relevance`` (and anything
+    unknown) ranks search matches first, falling back to newest items.
+    """
+
+    sort_param = "sort"
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = ITEM_SORTS.get(request.query_params.get(self.sort_param))
+        if ordering is None:
+            if "relevance" in queryset.query.annotations:
+                ordering = ("-relevance", "-created_at")
+            else:
+                ordering = ("-created_at",)
+        return queryset.order_by(*ordering)
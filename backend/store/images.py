@@ -0,0 +1,167 @@
+"""
+Derived item image sizes.
+
+After an item's images are saved, a background thread downloads each
+original from image storage, renders the IMAGE_VARIANTS sizes with Pillow
+and stores them next to it. Item.image_variants then holds one entry per
+image_urls entry, e.g. ``{"thumb": url, "card": url, "detail": url}``; an
+empty entry means the image could not be processed (or is hosted
+elsewhere) and readers fall back to the original URL.
+"""
+
+import io
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from backend.metrics import track_outbound
+from store.cache import invalidate_item
+from store.models import Item
+from store.storage import get_executor, get_image_storage
+from store.uploads import ALLOWED_IMAGE_TYPES
+
+logger = logging.getLogger(__name__)
+
+# name -> longest side in pixels; images are never upscaled
+IMAGE_VARIANTS = {"thumb": 150, "card": 400, "detail": 1000}
+FORMATS = {
+    "WEBP": ("webp", "image/webp"),
+    "JPEG": ("jpg", "image/jpeg"),
+}
+# refuse decompression bombs well before Pillow's own (warning-only) limit
+MAX_SOURCE_PIXELS = 40_000_000
+
+
+def render_variants(data, image_format):
+    """Yield ``(name, bytes)`` for every IMAGE_VARIANTS size of image ``data``."""
+    with Image.open(io.BytesIO(data)) as source:
+        if source.width * source.height > MAX_SOURCE_PIXELS:
+            raise ValueError(f"image too large ({source.width}x{source.height})")
+        image = ImageOps.exif_transpose(source)
+        has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+        mode = "RGBA" if has_alpha and image_format == "WEBP" else "RGB"
+        image = image.convert(mode)
+        # largest first, so each size is downscaled from the previous one
+        for name, size in sorted(IMAGE_VARIANTS.items(), key=lambda kv: -kv[1]):
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            out = io.BytesIO()
+            options = {"quality": 80}
+            if image_format == "WEBP":
+                options["method"] = 4
+            image.save(out, image_format, **options)
+            yield name, out.getvalue()
+
+
+def image_content_type(data):
+    """The MIME type of image ``data`` according to Pillow, or None if it is not one."""
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.width * image.height > MAX_SOURCE_PIXELS:
+                return None
+            image.verify()
+            return Image.MIME.get(image.format)
+    except (OSError, ValueError, SyntaxError, Image.DecompressionBombError):
+        return None
+
+
+def build_variants(storage, url, verify=False):
+    """
+    Render and store the variants of one image URL; {} if it cannot be done.
+    With ``verify``, None if the original is not really an image of the type
+    its extension claims.
+    """
+    path = storage.path_for_url(url)
+    if path is None:
+        return {}
+    image_format = getattr(settings, "IMAGE_VARIANT_FORMAT", "WEBP")
+    extension, content_type = FORMATS[image_format]
+    stem, original_extension = os.path.splitext(path)
+    try:
+        with track_outbound(storage.name, "download"):
+            data = storage.read(path)
+        if verify:
+            actual = ALLOWED_IMAGE_TYPES.get(image_content_type(data))
+            if actual != original_extension:
+                return None
+        variants = {}
+        for name, body in render_variants(data, image_format):
+            with track_outbound(storage.name, "upload"):
+                variants[name] = storage.save(
+                    f"{stem}-{name}.{extension}", ContentFile(body), content_type
+                )
+        return variants
+    except (OSError, ValueError, UnidentifiedImageError, Image.DecompressionBombError):
+        logger.warning("could not build variants for %s", url, exc_info=True)
+        return {}
+
+
+def generate_item_variants(item_id, unverified=()):
+    """
+    Build variants for every image of an item and record them, unless the
+    item's images changed meanwhile (the newer change schedules its own run).
+
+    ``unverified`` URLs (direct uploads, which storage accepted without
+    looking at them) are checked first; those that are not images are
+    deleted and dropped from the item.
+    """
+    close_old_connections()
+    try:
+        storage = get_image_storage()
+        item = Item.objects.filter(pk=item_id).only("image_urls", "category_id").first()
+        if storage is None or item is None or not item.image_urls:
+            return
+        variants = [
+            build_variants(storage, url, verify=url in unverified)
+            for url in item.image_urls
+        ]
+        rejected = [url for url, built in zip(item.image_urls, variants) if built is None]
+        if rejected:
+            reject_images(storage, item_id, rejected)
+            return
+        updated = Item.objects.filter(pk=item_id, image_urls=item.image_urls).update(
+            image_variants=variants
+        )
+        if updated:
+            invalidate_item(item_id, item.category_id)
+    except Exception:
+        logger.exception("image variant generation failed for item %s", item_id)
+    finally:
+        close_old_connections()
+
+
+def reject_images(storage, item_id, urls):
+    """Delete uploaded originals that are not images and drop them from the item."""
+    with track_outbound(storage.name, "delete"):
+        storage.delete([storage.path_for_url(url) for url in urls])
+    with transaction.atomic():
+        item = Item.objects.select_for_update().filter(pk=item_id).first()
+        if item is None:
+            return
+        # saving clears the variants and schedules a run for the rest
+        item.image_urls = [url for url in item.image_urls or [] if url not in urls]
+        item.save(update_fields=["image_urls", "updated_at"])
+    logger.warning("rejected uploads that are not images for item %s: %s", item_id, urls)
+
+
+def schedule_item_variants(item_id, unverified=()):
+    """Build an item's variants on a background thread after the current commit."""
+    executor = get_executor(
+        "image-variants", getattr(settings, "IMAGE_VARIANT_WORKERS", 2)
+    )
+    unverified = frozenset(unverified)
+    transaction.on_commit(
+        lambda: executor.submit(generate_item_variants, item_id, unverified)
+    )
+
+
+def variant_urls(item, variant):
+    """The item's image URLs at ``variant`` size, falling back to the originals."""
+    variants = item.image_variants or []
+    return [
+        (variants[index] if index < len(variants) else {}).get(variant) or url
+        for index, url in enumerate(item.image_urls or [])
+    ]
@@ -0,0 +1,274 @@
+import json
+import logging
+import math
+import statistics
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import Seller, User
+from store.models import Cart, CartItem, Category, Item, OrderUser
+
+DEFAULT_BUDGETS = Path(__file__).resolve().parents[2] / "benchmark_budgets.json"
+# recorded latency budgets leave room for run-to-run noise
+LATENCY_HEADROOM = 1.5
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the hot store endpoints in-process against data from seed_catalog, "
+        "report latency percentiles and query counts, and fail when a budget "
+        "in benchmark_budgets.json is exceeded."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--prefix", default="seed", help="seed_catalog --prefix of the dataset")
+        parser.add_argument("--iterations", type=int, default=30)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--only", default="", help="comma-separated scenario names")
+        parser.add_argument("--budgets", default=str(DEFAULT_BUDGETS))
+        parser.add_argument(
+            "--queries-only",
+            action="store_true",
+            help="enforce query budgets only (latency depends on the machine)",
+        )
+        parser.add_argument(
+            "--record", action="store_true", help="write the measured values as the new budgets"
+        )
+        parser.add_argument("--json", dest="json_path", help="also write results to this file")
+        parser.add_argument(
+            "--response-cache",
+            action="store_true",
+            help="serve repeated reads from the response cache (budgets measure uncached work)",
+        )
+
+    def handle(self, *args, **options):
+        fixtures = self.find_fixtures(options["prefix"])
+        scenarios = self.scenarios(fixtures)
+        if options["only"]:
+            wanted = set(options["only"].split(","))
+            unknown = wanted - {scenario["name"] for scenario in scenarios}
+            if unknown:
+                raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+            scenarios = [scenario for scenario in scenarios if scenario["name"] in wanted]
+
+        # per-request log lines (and N+1 warnings) would drown the report
+        request_logger = logging.getLogger("backend.middleware")
+        level = request_logger.level
+        request_logger.setLevel(logging.ERROR)
+        # a zero timeout stores nothing, so every request does the full work
+        response_cache = (
+            nullcontext()
+            if options["response_cache"]
+            else override_settings(RESPONSE_CACHE_TIMEOUT=0)
+        )
+        try:
+            with response_cache:
+                results = {
+                    scenario["name"]: self.run(scenario, options["warmup"], options["iterations"])
+                    for scenario in scenarios
+                }
+        finally:
+            request_logger.setLevel(level)
+
+        self.report(results)
+        if options["json_path"]:
+            Path(options["json_path"]).write_text(json.dumps(results, indent=2))
+
+        budgets_path = Path(options["budgets"])
+        budgets = json.loads(budgets_path.read_text()) if budgets_path.exists() else {}
+        if options["record"]:
+            for name, result in results.items():
+                budgets[name] = {
+                    "max_queries": result["queries"],
+                    "p95_ms": round(result["p95_ms"] * LATENCY_HEADROOM, 1),
+                }
+            budgets_path.write_text(json.dumps(budgets, indent=2, sort_keys=True) + "\n")
+            self.stdout.write(f"budgets written to {budgets_path}")
+            return
+
+        failures = self.check_budgets(results, budgets, options["queries_only"])
+        if failures:
+            raise CommandError("Budget regressions:\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS("all endpoints within budget"))
+
+    def find_fixtures(self, prefix):
+        buyer = (
+            User.objects.filter(email__startswith=f"{prefix}-user-")
+            .annotate(orders=Count("order_users__orders"))
+            .order_by("-orders", "id")
+            .first()
+        )
+        seller = (
+            Seller.objects.filter(user__email__startswith=f"{prefix}-seller-")
+            .annotate(sold=Count("order_items"))
+            .order_by("-sold", "user_id")
+            .first()
+        )
+        if buyer is None or seller is None:
+            raise CommandError(
+                f"No data seeded with prefix '{prefix}'; run seed_catalog first."
+            )
+        roots = Category.objects.filter(name__startswith=f"{prefix} ", depth=0)
+        category = max(
+            roots,
+            key=lambda root: Item.objects.filter(category__path__startswith=root.path).count(),
+        )
+        items = list(
+            Item.objects.filter(is_active=True, quantity__gte=10, seller__user__email__startswith=f"{prefix}-")
+            .annotate(sold=Count("order_items"))
+            .order_by("-sold", "id")
+            .values_list("id", flat=True)[:3]
+        )
+        if len(items) < 3:
+            raise CommandError("The seeded dataset has too few items in stock.")
+        return {"buyer": buyer, "seller": seller.user, "category": category, "items": items}
+
+    def scenarios(self, fixtures):
+        buyer, items = fixtures["buyer"], fixtures["items"]
+        category_items = f"/api/store/categories/{fixtures['category'].pk}/items/"
+
+        def fill_cart():
+            # the buyer's cart holds exactly the benchmark items
+            cart, _ = Cart.objects.get_or_create(user=buyer, seller=None)
+            cart.cart_items.all().delete()
+            CartItem.objects.bulk_create(
+                [CartItem(cart=cart, item_id=item_id, quantity=1) for item_id in items]
+            )
+            if not OrderUser.objects.filter(user=buyer, is_default=True).exists():
+                OrderUser.objects.create(
+                    user=buyer,
+                    phone_no="9000000000",
+                    address="1, Benchmark Road",
+                    city="Bengaluru",
+                    state="Karnataka",
+                    pincode="560001",
+                    is_default=True,
+                )
+
+        return [
+            {"name": "category-tree", "method": "get", "path": "/api/store/categories/", "user": None},
+            {
+                "name": "category-items-sorted",
+                "method": "get",
+                "path": f"{category_items}?sort=price_desc",
+                "user": buyer,
+            },
+            {
+                "name": "category-items-search",
+                "method": "get",
+                "path": f"{category_items}?search=rice&sort=relevance",
+                "user": buyer,
+            },
+            {"name": "item-detail", "method": "get", "path": f"/api/store/new-items/{items[0]}/", "user": None},
+            {
+                "name": "cart-add",
+                "method": "post",
+                "path": "/api/store/cart/",
+                "data": {"item_ids": items, "quantities": [1, 2, 1]},
+                "user": buyer,
+                "writes": True,
+            },
+            {
+                "name": "cart-patch",
+                "method": "patch",
+                "path": "/api/store/cart/",
+                "data": {"item_id": items[0], "quantity": 3},
+                "user": buyer,
+                "setup": fill_cart,
+                "writes": True,
+            },
+            {
+                "name": "checkout",
+                "method": "post",
+                "path": "/api/store/checkout/",
+                "data": {},
+                "user": buyer,
+                "setup": fill_cart,
+                "writes": True,
+            },
+            {"name": "user-orders", "method": "get", "path": "/api/store/user-orders/", "user": buyer},
+            {
+                "name": "seller-orders",
+                "method": "get",
+                "path": "/api/store/seller-orders/",
+                "user": fixtures["seller"],
+            },
+        ]
+
+    def request(self, client, scenario):
+        """One timed request; writes are rolled back so every run sees the same data."""
+        with transaction.atomic():
+            if scenario.get("setup"):
+                scenario["setup"]()
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = getattr(client, scenario["method"])(
+                    scenario["path"], scenario.get("data"), format="json"
+                )
+                elapsed = (time.perf_counter() - start) * 1000
+            if scenario.get("writes"):
+                transaction.set_rollback(True)
+        if response.status_code >= 400:
+            raise CommandError(
+                f"{scenario['name']}: {scenario['method'].upper()} {scenario['path']} "
+                f"returned {response.status_code}: {response.content[:200]!r}"
+            )
+        return elapsed, len(queries)
+
+    def run(self, scenario, warmup, iterations):
+        client = APIClient()
+        if scenario["user"] is not None:
+            client.force_authenticate(scenario["user"])
+        for _ in range(warmup):
+            self.request(client, scenario)
+        timings, query_counts = [], []
+        for _ in range(iterations):
+            elapsed, count = self.request(client, scenario)
+            timings.append(elapsed)
+            query_counts.append(count)
+        return {
+            "queries": max(query_counts),
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+            "p99_ms": round(percentile(timings, 0.99), 2),
+            "max_ms": round(max(timings), 2),
+        }
+
+    def report(self, results):
+        self.stdout.write(
+            f"{'scenario':<24}{'queries':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<24}{result['queries']:>8}{result['p50_ms']:>10}"
+                f"{result['p95_ms']:>10}{result['p99_ms']:>10}{result['max_ms']:>10}"
+            )
+
+    def check_budgets(self, results, budgets, queries_only):
+        failures = []
+        for name, result in results.items():
+            budget = budgets.get(name)
+            if budget is None:
+                self.stdout.write(self.style.WARNING(f"{name}: no budget recorded"))
+                continue
+            if result["queries"] > budget["max_queries"]:
+                failures.append(
+                    f"{name}: {result['queries']} queries (budget {budget['max_queries']})"
+                )
+            if not queries_only and result["p95_ms"] > budget["p95_ms"]:
+                failures.append(
+                    f"{name}: p95 {result['p95_ms']} ms (budget {budget['p95_ms']} ms)"
+                )
+        return failures
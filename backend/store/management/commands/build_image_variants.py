@@ -0,0 +1,47 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from store.images import generate_item_variants
+from store.models import Item
+from store.storage import get_image_storage
+
+
+class Command(BaseCommand):
+    help = (
+        "Build thumbnail/card/detail image variants for items that are missing "
+        "them (e.g. created before variants existed, or imported)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="rebuild items that already have variants")
+        parser.add_argument("--item", type=int, action="append", dest="items", help="only this item id (repeatable)")
+        parser.add_argument("--workers", type=int, default=4)
+
+    def handle(self, *args, **options):
+        if get_image_storage() is None:
+            raise CommandError("No image storage is configured (IMAGE_STORAGE_BACKEND).")
+
+        items = Item.objects.exclude(image_urls=[]).exclude(image_urls__isnull=True)
+        if options["items"]:
+            items = items.filter(pk__in=options["items"])
+        pending = [
+            pk
+            for pk, urls, variants in items.order_by("pk")
+            .values_list("id", "image_urls", "image_variants")
+            .iterator(chunk_size=2000)
+            if options["all"] or len(variants or []) != len(urls)
+        ]
+        self.stdout.write(f"{len(pending)} items to process")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            for done, _ in enumerate(executor.map(generate_item_variants, pending), start=1):
+                if done % 100 == 0:
+                    self.stdout.write(f"  {done}/{len(pending)}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"processed {len(pending)} items in {time.perf_counter() - start:.1f}s"
+            )
+        )
@@ -0,0 +1,73 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Seller
+from store.bulk import BATCH_SIZE, FORMATS, ImportFileError, detect_format, import_items
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a seller's catalog from a CSV or JSON Lines file. With --sync the "
+        "file is the full catalog: only new and changed rows are written and "
+        "items missing from it are deactivated."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSONL file")
+        parser.add_argument("--seller", required=True, help="seller account email")
+        parser.add_argument("--format", choices=FORMATS, help="defaults to the file extension")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="validate without writing")
+        parser.add_argument("--sync", action="store_true", help="apply the file as a full catalog snapshot")
+        parser.add_argument("--report", help="write the full JSON report to this file")
+
+    def handle(self, *args, **options):
+        try:
+            seller = Seller.objects.get(user__email=options["seller"])
+        except Seller.DoesNotExist:
+            raise CommandError(f"No seller with email {options['seller']}")
+
+        start = time.perf_counter()
+        try:
+            fmt = options["format"] or detect_format(options["path"])
+            with open(options["path"], "rb") as fileobj:
+                report = import_items(
+                    seller,
+                    fileobj,
+                    fmt,
+                    batch_size=options["batch_size"],
+                    dry_run=options["dry_run"],
+                    sync=options["sync"],
+                )
+        except ImportFileError as e:
+            if e.report is not None and e.report["rows"]:
+                raise CommandError(
+                    f"{e} ({e.report['rows']} rows read before it: {self.summary(e.report)})"
+                )
+            raise CommandError(str(e))
+        except OSError as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - start
+
+        if options["report"]:
+            with open(options["report"], "w") as out:
+                json.dump(report, out, indent=2, default=str)
+        for error in report["errors"][:20]:
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['errors'], default=str)}")
+        if report["failed"] > 20:
+            self.stderr.write(f"... {report['failed'] - 20} more failing rows")
+        dry_run = " (dry run)" if options["dry_run"] else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report['rows']} rows in {elapsed:.1f}s{dry_run}: {self.summary(report)}"
+            )
+        )
+
+    def summary(self, report):
+        return ", ".join(
+            f"{name} {report[name]}"
+            for name in ("created", "updated", "unchanged", "deactivated", "failed")
+            if name in report
+        )
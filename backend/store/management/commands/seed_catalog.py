@@ -0,0 +1,439 @@
+import random
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from accounts.models import Seller, User
+from payments.models import Payment
+from store.cache import CATEGORY_TREE_VERSION, bump_version, invalidate_catalog
+from store.models import (
+    Cart,
+    CartItem,
+    Category,
+    Item,
+    Order,
+    OrderItem,
+    OrderUser,
+)
+
+# fixed so that the same seed produces byte-identical data on every run
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+ADJECTIVES = [
+    "Fresh", "Organic", "Premium", "Classic", "Crunchy", "Spicy", "Sweet",
+    "Roasted", "Whole", "Instant", "Natural", "Farm", "Golden", "Healthy",
+    "Tangy", "Creamy", "Baked", "Masala", "Smoked", "Lite",
+]
+PRODUCTS = [
+    "Apples", "Basmati Rice", "Toor Dal", "Atta", "Green Tea", "Coffee",
+    "Almonds", "Cashews", "Chips", "Cookies", "Paneer", "Ghee", "Butter",
+    "Curd", "Milk", "Bread", "Honey", "Jam", "Oats", "Muesli", "Noodles",
+    "Pasta", "Ketchup", "Pickle", "Olive Oil", "Sunflower Oil", "Sugar",
+    "Salt", "Turmeric", "Chilli Powder", "Detergent", "Shampoo", "Soap",
+    "Toothpaste", "Dishwash Bar", "Bananas", "Onions", "Tomatoes",
+    "Potatoes", "Mangoes",
+]
+ITEM_TYPES = ["fruit", "vegetable", "grocery", "snack", "beverage", "dairy", "household"]
+BRAND_PARTS = ["Amul", "Tata", "Fresho", "Nature", "Royal", "Desi", "Happy", "Sun", "Gold", "Green"]
+BRAND_SUFFIXES = ["Foods", "Farms", "Mart", "Co", "Essentials", "Organics", "Naturals", "Kitchen"]
+ITEM_NAMES = [f"{adjective} {product}" for adjective in ADJECTIVES for product in PRODUCTS]
+CITIES = [("Bengaluru", "Karnataka"), ("Mysuru", "Karnataka"), ("Chennai", "Tamil Nadu")]
+
+
+@contextmanager
+def historical_timestamps(*models):
+    """Let bulk_create keep explicit created_at/updated_at values."""
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def skewed_index(rng, n, skew):
+    """Index in [0, n) where low indices are far more likely (power law)."""
+    return min(int(n * rng.random() ** skew), n - 1)
+
+
+def scatter(rank, n):
+    """Spread popularity ranks over the id range so hot rows aren't adjacent."""
+    return (rank * 7919 + 13) % n if n % 7919 else rank
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large, deterministic synthetic catalog (categories, sellers, "
+        "items, carts, orders and payments) for performance work."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default="seed", help="namespace for emails, SKUs and names")
+        parser.add_argument("--categories", type=int, default=500)
+        parser.add_argument("--depth", type=int, default=5, help="maximum category depth")
+        parser.add_argument("--sellers", type=int, default=300)
+        parser.add_argument("--users", type=int, default=10000, help="buyers")
+        parser.add_argument("--items", type=int, default=100000)
+        parser.add_argument("--carts", type=int, default=5000)
+        parser.add_argument("--orders", type=int, default=50000)
+        parser.add_argument("--days", type=int, default=365, help="history length for orders")
+        parser.add_argument("--skew", type=float, default=3.0, help="popularity exponent (1 = uniform)")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--password", default="password123", help="password for every seeded user")
+        parser.add_argument("--flush", action="store_true", help="delete data seeded earlier with this prefix first")
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.prefix = options["prefix"]
+        self.batch_size = options["batch_size"]
+        self.skew = options["skew"]
+        self.rng = random.Random(options["seed"])
+
+        if options["flush"]:
+            self.flush()
+        elif User.objects.filter(email__startswith=f"{self.prefix}-").exists():
+            raise CommandError(
+                f"Data seeded with prefix '{self.prefix}' already exists; "
+                "use --flush or another --prefix."
+            )
+        if options["depth"] < 1 or options["categories"] < 1 or options["sellers"] < 1:
+            raise CommandError("--categories, --sellers and --depth must be at least 1.")
+
+        self.password = make_password(options["password"], salt=f"{self.prefix}seedsalt")
+        with historical_timestamps(
+            Category, User, Seller, Item, Cart, CartItem, OrderUser, OrderItem, Order, Payment
+        ):
+            categories = self.step("categories", self.create_categories)
+            sellers = self.step("sellers", self.create_sellers)
+            buyers = self.step("buyers", self.create_buyers)
+            self.step("items", self.create_items, categories, sellers)
+            self.step("carts", self.create_carts, buyers)
+            self.step("orders", self.create_orders, buyers)
+
+        bump_version(CATEGORY_TREE_VERSION)
+        invalidate_catalog()
+        self.step("analyze", self.analyze)
+
+    def step(self, name, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        self.stdout.write(f"{name}: done in {time.perf_counter() - start:.1f}s")
+        return result
+
+    def moment(self, days_ago_max):
+        return EPOCH - timedelta(seconds=self.rng.randrange(int(days_ago_max * 86400) + 1))
+
+    def flush(self):
+        with transaction.atomic():
+            # cascades to sellers, items, carts, addresses, orders and payments
+            User.objects.filter(email__startswith=f"{self.prefix}-").delete()
+            Category.objects.filter(name__startswith=f"{self.prefix} ").delete()
+            invalidate_catalog()
+        self.stdout.write(f"flushed data seeded with prefix '{self.prefix}'")
+
+    # ------------------------------------------------------------------
+    # catalog
+    # ------------------------------------------------------------------
+    def create_categories(self):
+        total, max_depth = self.options["categories"], self.options["depth"]
+        roots = total if max_depth == 1 else max(1, min(total, round(total**0.5 / 2)))
+        # decide the shape first, then insert one level at a time so every
+        # parent has a primary key (and a path) before its children
+        levels = [[(index, None) for index in range(roots)]]
+        depth_of = dict.fromkeys(range(roots), 0)
+        can_parent = list(range(roots))
+        for index in range(roots, total):
+            parent = can_parent[skewed_index(self.rng, len(can_parent), 1.5)]
+            depth = depth_of[index] = depth_of[parent] + 1
+            if depth == len(levels):
+                levels.append([])
+            levels[depth].append((index, parent))
+            if depth < max_depth - 1:
+                can_parent.append(index)
+
+        created = {}
+        for depth, level in enumerate(levels):
+            objs = [
+                Category(
+                    name=f"{self.prefix} {self.rng.choice(PRODUCTS)} {index}",
+                    description="",
+                    parent=created[parent] if parent is not None else None,
+                    depth=depth,
+                    created_at=self.moment(self.options["days"] * 2),
+                )
+                for index, parent in level
+            ]
+            Category.objects.bulk_create(objs, batch_size=self.batch_size)
+            for (index, parent), category in zip(level, objs):
+                parent_path = created[parent].path if parent is not None else "/"
+                category.path = f"{parent_path}{category.pk}/"
+                created[index] = category
+            Category.objects.bulk_update(objs, ["path"], batch_size=self.batch_size)
+        return [created[index] for index in sorted(created)]
+
+    def create_sellers(self):
+        count = self.options["sellers"]
+        users = [
+            User(
+                email=f"{self.prefix}-seller-{index}@example.com",
+                password=self.password,
+                first_name=f"Seller{index}",
+                is_active=True,
+                is_email_verified=True,
+                date_joined=self.moment(self.options["days"] * 2),
+            )
+            for index in range(count)
+        ]
+        User.objects.bulk_create(users, batch_size=self.batch_size)
+        sellers = []
+        for index, user in enumerate(users):
+            brand = f"{self.rng.choice(BRAND_PARTS)} {self.rng.choice(BRAND_SUFFIXES)}"
+            sellers.append(
+                Seller(
+                    user=user,
+                    shop_name=f"{brand} {index}",
+                    gst_number=f"29{self.rng.randrange(10**11):011d}Z{index % 10}",
+                    seller_type=self.rng.choice(["individual", "wholesaler", "enterprise"]),
+                    created_at=user.date_joined,
+                    updated_at=user.date_joined,
+                )
+            )
+        Seller.objects.bulk_create(sellers, batch_size=self.batch_size)
+        return sellers
+
+    def create_buyers(self):
+        count = self.options["users"]
+        buyers = []
+        for start in range(0, count, self.batch_size):
+            batch = [
+                User(
+                    email=f"{self.prefix}-user-{index}@example.com",
+                    password=self.password,
+                    first_name=f"User{index}",
+                    is_active=True,
+                    is_email_verified=True,
+                    date_joined=self.moment(self.options["days"] * 2),
+                )
+                for index in range(start, min(start + self.batch_size, count))
+            ]
+            User.objects.bulk_create(batch)
+            buyers.extend((user.pk, user.email) for user in batch)
+        return buyers
+
+    def create_items(self, categories, sellers):
+        count = self.options["items"]
+        manufacturers = [
+            f"{part} {suffix}" for part in BRAND_PARTS for suffix in BRAND_SUFFIXES
+        ]
+        # compact per-item data kept for carts/orders (millions of rows)
+        self.item_ids = array("q")
+        self.item_prices = array("q")  # paise
+        self.item_sellers = array("q")
+        self.item_names = array("H")  # index into ITEM_NAMES
+        for start in range(0, count, self.batch_size):
+            batch = []
+            for index in range(start, min(start + self.batch_size, count)):
+                rng = self.rng
+                name_index = rng.randrange(len(ITEM_NAMES))
+                self.item_names.append(name_index)
+                name = ITEM_NAMES[name_index]
+                price = Decimal(round(rng.lognormvariate(4.5, 0.9), 2)).quantize(Decimal("0.01"))
+                price = max(price, Decimal("1.00"))
+                mrp = None
+                if rng.random() < 0.6:
+                    mrp = (price * Decimal(1 + rng.random() * 0.5)).quantize(Decimal("0.01"))
+                created_at = self.moment(self.options["days"] * 2)
+                batch.append(
+                    Item(
+                        seller=sellers[skewed_index(rng, len(sellers), self.skew / 2)],
+                        item_name=name,
+                        item_type=rng.choice(ITEM_TYPES),
+                        manufacturer=manufacturers[skewed_index(rng, len(manufacturers), 2)],
+                        category=categories[skewed_index(rng, len(categories), 1.5)],
+                        quantity=0 if rng.random() < 0.05 else rng.randrange(1, 500),
+                        price=price,
+                        mrp=mrp,
+                        image_urls=[],
+                        sku=f"{self.prefix}-{index:08d}",
+                        description=f"{name} from the {rng.choice(ITEM_TYPES)} aisle.",
+                        is_active=rng.random() > 0.03,
+                        created_at=created_at,
+                        updated_at=created_at,
+                    )
+                )
+            for item in batch:
+                # bulk_create() skips Item.save()
+                item.content_hash = item.compute_content_hash()
+            with transaction.atomic():
+                Item.objects.bulk_create(batch)
+            for item in batch:
+                self.item_ids.append(item.pk)
+                self.item_prices.append(int(item.price * 100))
+                self.item_sellers.append(item.seller_id)
+            self.stdout.write(f"  items {start + len(batch)}/{count}")
+
+    def popular_item(self):
+        n = len(self.item_ids)
+        return scatter(skewed_index(self.rng, n, self.skew), n)
+
+    # ------------------------------------------------------------------
+    # activity
+    # ------------------------------------------------------------------
+    def create_carts(self, buyers):
+        count = min(self.options["carts"], len(buyers))
+        if not count or not self.item_ids:
+            return
+        owners = self.rng.sample(buyers, count)
+        for start in range(0, count, self.batch_size):
+            carts = [
+                Cart(user_id=user_id, created_at=self.moment(30), updated_at=EPOCH)
+                for user_id, _ in owners[start : start + self.batch_size]
+            ]
+            with transaction.atomic():
+                Cart.objects.bulk_create(carts)
+                cart_items = []
+                for cart in carts:
+                    picked = {self.popular_item() for _ in range(self.rng.randrange(1, 16))}
+                    cart_items.extend(
+                        CartItem(
+                            cart=cart,
+                            item_id=self.item_ids[index],
+                            quantity=self.rng.randrange(1, 5),
+                            added_at=cart.created_at,
+                        )
+                        for index in sorted(picked)
+                    )
+                CartItem.objects.bulk_create(cart_items, batch_size=self.batch_size)
+
+    def order_status(self, created_at):
+        age = (EPOCH - created_at).days
+        roll = self.rng.random()
+        if age < 2:
+            return "pending" if roll < 0.6 else "processing"
+        if age < 7:
+            return "shipped" if roll < 0.7 else "processing"
+        return "cancelled" if roll < 0.06 else "delivered"
+
+    def create_orders(self, buyers):
+        count = self.options["orders"]
+        if not count or not buyers or not self.item_ids:
+            return
+        # one saved address per buyer that ever orders
+        addresses = {}
+        Through = Order.order_items.through
+        for start in range(0, count, self.batch_size):
+            size = min(self.batch_size, count - start)
+            # heavy users: a few buyers place most orders
+            placed_by = [
+                buyers[scatter(skewed_index(self.rng, len(buyers), self.skew), len(buyers))]
+                for _ in range(size)
+            ]
+            with transaction.atomic():
+                new_addresses = []
+                for user_id, _ in placed_by:
+                    if user_id not in addresses:
+                        city, state = self.rng.choice(CITIES)
+                        address = OrderUser(
+                            user_id=user_id,
+                            phone_no=f"9{self.rng.randrange(10**9):09d}",
+                            address=f"{self.rng.randrange(1, 999)}, {self.rng.randrange(1, 40)}th Cross",
+                            city=city,
+                            state=state,
+                            pincode=f"560{self.rng.randrange(1000):03d}",
+                            is_default=True,
+                            created_at=EPOCH - timedelta(days=self.options["days"] + 1),
+                            updated_at=EPOCH - timedelta(days=self.options["days"] + 1),
+                        )
+                        addresses[user_id] = address
+                        new_addresses.append(address)
+                OrderUser.objects.bulk_create(new_addresses)
+
+                orders, lines = [], []
+                for user_id, email in placed_by:
+                    created_at = self.moment(self.options["days"])
+                    picked = {self.popular_item() for _ in range(self.rng.randrange(1, 7))}
+                    order_lines = [
+                        OrderItem(
+                            item_name=ITEM_NAMES[self.item_names[index]],
+                            price=Decimal(self.item_prices[index]) / 100,
+                            quantity=self.rng.randrange(1, 4),
+                            seller_id=self.item_sellers[index],
+                            original_item_id=self.item_ids[index],
+                            created_at=created_at,
+                            updated_at=created_at,
+                        )
+                        for index in sorted(picked)
+                    ]
+                    status = self.order_status(created_at)
+                    orders.append(
+                        Order(
+                            status=status,
+                            buyer_email=email,
+                            total_amount=sum(line.price * line.quantity for line in order_lines),
+                            order_user=addresses[user_id],
+                            tracking_number=(
+                                f"TRK{self.rng.randrange(10**10):010d}"
+                                if status in ("shipped", "delivered")
+                                else None
+                            ),
+                            shipped_at=created_at + timedelta(days=1) if status in ("shipped", "delivered") else None,
+                            delivered_at=created_at + timedelta(days=3) if status == "delivered" else None,
+                            created_at=created_at,
+                            updated_at=created_at,
+                        )
+                    )
+                    lines.append(order_lines)
+
+                OrderItem.objects.bulk_create([line for group in lines for line in group])
+                Order.objects.bulk_create(orders)
+                Through.objects.bulk_create(
+                    [
+                        Through(order_id=order.pk, orderitem_id=line.pk)
+                        for order, group in zip(orders, lines)
+                        for line in group
+                    ],
+                    batch_size=self.batch_size,
+                )
+                Payment.objects.bulk_create(
+                    [
+                        Payment(
+                            user_id=order.order_user.user_id,
+                            seller_id=group[0].seller_id,
+                            order=order,
+                            amount=order.total_amount,
+                            status="failed" if order.status == "cancelled" else "success",
+                            is_success=order.status != "cancelled",
+                            transaction_id=f"{self.prefix}_order_{order.pk}",
+                            created_at=order.created_at,
+                            updated_at=order.created_at,
+                        )
+                        for order, group in zip(orders, lines)
+                        if order.status != "pending"
+                    ]
+                )
+            self.stdout.write(f"  orders {start + size}/{count}")
+
+    def analyze(self):
+        # fresh planner statistics, so benchmarks see realistic plans
+        tables = [
+            model._meta.db_table
+            for model in (Category, User, Seller, Item, Cart, CartItem, OrderUser, OrderItem, Order, Payment)
+        ] + [Order.order_items.through._meta.db_table]
+        with connection.cursor() as cursor:
+            for table in tables:
+                cursor.execute(f'ANALYZE "{table}"')
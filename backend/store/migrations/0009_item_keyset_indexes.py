@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_otp_sent_count_user_otp_sent_window_start'),
+        ('store', '0008_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['price', 'id'], name='store_item_price_f793cc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['created_at', 'id'], name='store_item_created_10bcf6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['category', 'price', 'id'], name='store_item_categor_af5c99_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['category', 'created_at', 'id'], name='store_item_categor_3c80a8_idx'),
+        ),
+    ]
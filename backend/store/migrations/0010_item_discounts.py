@@ -0,0 +1,48 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:47
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_otp_sent_count_user_otp_sent_window_start'),
+        ('store', '0009_item_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='mrp',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='saving_amount',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Greatest(django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Coalesce(models.F('mrp'), models.F('price')), '-', models.F('price')), models.Value(Decimal('0'))), output_field=models.DecimalField(decimal_places=2, max_digits=10)),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='percent_off',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(mrp__gt=models.F('price'), then=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('mrp'), '-', models.F('price')), '*', models.Value(Decimal('100'))), '/', models.F('mrp'))), default=models.Value(Decimal('0'))), output_field=models.DecimalField(decimal_places=2, max_digits=5)),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['saving_amount', 'id'], name='store_item_saving__a3d615_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['percent_off', 'id'], name='store_item_percent_433ba0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['category', 'saving_amount', 'id'], name='store_item_categor_57a5f6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['category', 'percent_off', 'id'], name='store_item_categor_783c5c_idx'),
+        ),
+    ]
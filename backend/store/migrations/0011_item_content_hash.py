@@ -0,0 +1,64 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:06
+
+import hashlib
+import json
+from decimal import Decimal
+
+from django.db import migrations, models
+
+# frozen copies of store.models.CONTENT_HASH_FIELDS/content_hash as of this
+# migration, so later changes to the live hashing do not rewrite history
+CONTENT_HASH_FIELDS = (
+    "item_name",
+    "item_type",
+    "manufacturer",
+    "category_id",
+    "quantity",
+    "price",
+    "mrp",
+    "description",
+    "image_urls",
+)
+CENT = Decimal("0.01")
+
+
+def content_hash(values):
+    normalized = []
+    for name in CONTENT_HASH_FIELDS:
+        value = values.get(name)
+        if name in ("price", "mrp") and value is not None:
+            value = str(Decimal(str(value)).quantize(CENT))
+        elif name == "image_urls":
+            value = list(value or [])
+        normalized.append(value)
+    payload = json.dumps(normalized, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def populate_content_hashes(apps, schema_editor):
+    Item = apps.get_model("store", "Item")
+    batch = []
+    rows = Item.objects.only("id", *CONTENT_HASH_FIELDS).iterator(chunk_size=2000)
+    for item in rows:
+        item.content_hash = content_hash(item.__dict__)
+        batch.append(item)
+        if len(batch) == 2000:
+            Item.objects.bulk_update(batch, ["content_hash"])
+            batch = []
+    Item.objects.bulk_update(batch, ["content_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0010_item_discounts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(populate_content_hashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_otp_sent_count_user_otp_sent_window_start'),
+        ('store', '0012_item_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['quantity', 'id'], name='store_item_quantit_a14ca1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['updated_at', 'id'], name='store_item_updated_b1fea8_idx'),
+        ),
+    ]
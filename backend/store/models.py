@@ -1,9 +1,21 @@
-from django.db import models
+import hashlib
+import json
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Coalesce, Concat, Greatest, Substr
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from accounts.models import Seller, User
 from django.utils import timezone
 
 
+CATEGORY_CYCLE_MESSAGE = "A category cannot be moved under itself or its own subcategories."
+
+
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
@@ -22,13 +34,146 @@ class Category(models.Model):
         null=True,
         blank=True,
     )
+    # materialized ancestry, e.g. "/1/5/12/" for category 12 under 5 under 1.
+    # kept in sync by save(); subtree lookups are a single indexed prefix match
+    path = models.CharField(max_length=255, db_index=True, editable=False, default="")
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name_plural = "Categories"
+        indexes = [
+            GinIndex(
+                fields=["name"], name="store_category_name_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def is_in_subtree(self, category_id):
+        """Whether ``category_id`` is this category or one of its descendants."""
+        if not (self.pk and category_id):
+            return False
+        path = (
+            Category.objects.filter(pk=category_id).values_list("path", flat=True).first()
+        )
+        return f"/{self.pk}/" in (path or "")
+
+    def clean(self):
+        super().clean()
+        if self.is_in_subtree(self.parent_id):
+            raise ValidationError({"parent": CATEGORY_CYCLE_MESSAGE})
+
+    def save(self, *args, **kwargs):
+        if self.parent_id:
+            parent_path = Category.objects.values_list("path", flat=True).get(
+                pk=self.parent_id
+            )
+            # last resort: clean() and the serializer report this as a field error
+            if self.pk and f"/{self.pk}/" in parent_path:
+                raise ValueError(CATEGORY_CYCLE_MESSAGE)
+        else:
+            parent_path = "/"
+
+        with transaction.atomic():
+            old_path, old_depth = "", 0
+            if self.pk:
+                stored = (
+                    Category.objects.filter(pk=self.pk)
+                    .values_list("path", "depth")
+                    .first()
+                )
+                if stored:
+                    old_path, old_depth = stored
+
+            super().save(*args, **kwargs)
+
+            new_path = f"{parent_path}{self.pk}/"
+            if new_path != old_path:
+                self.path = new_path
+                self.depth = new_path.count("/") - 2
+                Category.objects.filter(pk=self.pk).update(
+                    path=self.path, depth=self.depth
+                )
+                if old_path:
+                    # re-root every descendant in one statement
+                    Category.objects.filter(path__startswith=old_path).exclude(
+                        pk=self.pk
+                    ).update(
+                        path=Concat(
+                            Value(new_path),
+                            Substr("path", len(old_path) + 1),
+                            output_field=models.CharField(),
+                        ),
+                        depth=F("depth") + (self.depth - old_depth),
+                    )
+
+    @property
+    def ancestor_ids(self):
+        """Ids from the root down to (and including) this category."""
+        return [int(pk) for pk in self.path.strip("/").split("/") if pk]
+
+    def get_ancestors(self, include_self=False):
+        """The ancestor chain, root first, resolved in a single query."""
+        ids = self.ancestor_ids if include_self else self.ancestor_ids[:-1]
+        return Category.objects.filter(pk__in=ids).order_by("depth")
+
+    def get_full_path(self):
+        names = self.get_ancestors(include_self=True).values_list("name", flat=True)
+        return " > ".join(names)
+
+    @classmethod
+    def get_full_paths(cls, categories):
+        """Map category id to its full path for many categories in one query."""
+        categories = list(categories)
+        ids = {pk for category in categories for pk in category.ancestor_ids}
+        names = dict(cls.objects.filter(pk__in=ids).values_list("id", "name"))
+        return {
+            category.id: " > ".join(
+                names[pk] for pk in category.ancestor_ids if pk in names
+            )
+            for category in categories
+        }
+
+    def get_descendants(self, include_self=True):
+        """All categories below this one (deleting a category cascades to them)."""
+        categories = Category.objects.filter(path__startswith=self.path)
+        if not include_self:
+            categories = categories.exclude(pk=self.pk)
+        return categories
+
+
+# seller-supplied catalog fields covered by Item.content_hash
+CONTENT_HASH_FIELDS = (
+    "item_name",
+    "item_type",
+    "manufacturer",
+    "category_id",
+    "quantity",
+    "price",
+    "mrp",
+    "description",
+    "image_urls",
+)
+CENT = Decimal("0.01")
+
+
+def content_hash(values):
+    """
+    Digest of a mapping holding CONTENT_HASH_FIELDS, normalized so a model
+    instance and a validated feed row with the same content hash equal.
+    """
+    normalized = []
+    for name in CONTENT_HASH_FIELDS:
+        value = values.get(name)
+        if name in ("price", "mrp") and value is not None:
+            value = str(Decimal(str(value)).quantize(CENT))
+        elif name == "image_urls":
+            value = list(value or [])
+        normalized.append(value)
+    payload = json.dumps(normalized, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
 
 class Item(models.Model):
     seller = models.ForeignKey(Seller, on_delete=models.CASCADE, related_name="items")
@@ -40,31 +185,140 @@ class Item(models.Model):
         Category, on_delete=models.SET_NULL, null=True, blank=True, related_name="items"
     )
     quantity = models.IntegerField()
+    # selling price; mrp is the printed list price it is discounted from
     price = models.DecimalField(max_digits=10, decimal_places=2, db_index=True)
+    mrp = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    saving_amount = models.GeneratedField(
+        expression=Greatest(
+            Coalesce(F("mrp"), F("price")) - F("price"), Value(Decimal("0"))
+        ),
+        output_field=models.DecimalField(max_digits=10, decimal_places=2),
+        db_persist=True,
+    )
+    percent_off = models.GeneratedField(
+        expression=Case(
+            When(
+                mrp__gt=F("price"),
+                then=(F("mrp") - F("price")) * Value(Decimal("100")) / F("mrp"),
+            ),
+            default=Value(Decimal("0")),
+        ),
+        output_field=models.DecimalField(max_digits=5, decimal_places=2),
+        db_persist=True,
+    )
 
     image_urls = models.JSONField(
         default=list,
         blank=True,
         null=True,
     )
+    # resized copies per image_urls entry, built by store.images
+    image_variants = models.JSONField(default=list, blank=True, editable=False)
     sku = models.CharField(max_length=100, unique=True, blank=True)
     description = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
     refers_token = models.BooleanField(default=False)
+    # lets catalog syncs skip rows whose content did not change
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # weighted full-text document maintained by Postgres on every write
+    search_vector = models.GeneratedField(
+        expression=SearchVector("item_name", weight="A", config="english")
+        + SearchVector("manufacturer", weight="B", config="english")
+        + SearchVector("description", weight="C", config="english"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     class Meta:
         indexes = [
             models.Index(fields=["seller", "is_active"]),
             models.Index(fields=["category", "is_active"]),
             models.Index(fields=["item_name", "is_active"]),
+            # keyset pagination: one index per sort order, id as tiebreaker
+            models.Index(fields=["price", "id"]),
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["category", "price", "id"]),
+            models.Index(fields=["category", "created_at", "id"]),
+            models.Index(fields=["saving_amount", "id"]),
+            models.Index(fields=["percent_off", "id"]),
+            models.Index(fields=["category", "saving_amount", "id"]),
+            models.Index(fields=["category", "percent_off", "id"]),
+            models.Index(fields=["quantity", "id"]),
+            models.Index(fields=["updated_at", "id"]),
+            GinIndex(fields=["search_vector"], name="store_item_search_gin"),
+            GinIndex(
+                fields=["item_name"],
+                name="store_item_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["manufacturer"],
+                name="store_item_manufacturer_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
         ]
 
     def __str__(self):
         return f"{self.item_name}({self.manufacturer})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # lets post_save invalidate the listing an item was moved out of
+        instance._loaded_category_id = instance.__dict__.get("category_id")
+        if "image_urls" in instance.__dict__:
+            instance._loaded_image_urls = list(instance.image_urls or [])
+        return instance
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        update_fields = kwargs.get("update_fields")
+        extra_fields = set()
+        if update_fields is None or set(update_fields) & set(CONTENT_HASH_FIELDS):
+            self.content_hash = self.compute_content_hash()
+            extra_fields.add("content_hash")
+        # post_save schedules a rebuild of the variants when this is set
+        self._images_changed = adding and bool(self.image_urls)
+        if (
+            not adding
+            and hasattr(self, "_loaded_image_urls")
+            and (update_fields is None or "image_urls" in update_fields)
+            and list(self.image_urls or []) != self._loaded_image_urls
+        ):
+            # variants are matched to image_urls by position, so they are
+            # stale as soon as the list changes
+            self.image_variants = []
+            self._images_changed = True
+            extra_fields.add("image_variants")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, *extra_fields}
+        super().save(*args, **kwargs)
+        self._loaded_image_urls = list(self.image_urls or [])
+        if not adding:
+            # generated columns are computed by Postgres; defer them so the
+            # next access reloads the values matching what was just saved
+            for field in self._meta.concrete_fields:
+                if field.generated:
+                    self.__dict__.pop(field.attname, None)
+
+    def delete(self, *args, **kwargs):
+        # instead of a delete signal receiver, see store.signals
+        from store.cache import invalidate_item
+
+        pk = self.pk
+        result = super().delete(*args, **kwargs)
+        invalidate_item(pk, self.category_id, getattr(self, "_loaded_category_id", None))
+        return result
+
+    def compute_content_hash(self):
+        return content_hash(
+            {name: getattr(self, name) for name in CONTENT_HASH_FIELDS}
+        )
+
     @property
     def is_in_stock(self):
         return self.quantity > 0
@@ -0,0 +1,192 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db.models import BooleanField, F, Func, Q, Value
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class RowComparison(Func):
+    """SQL row comparison, ``(col, ...) <op> (value, ...)``."""
+
+    output_field = BooleanField()
+
+    def __init__(self, columns, operator, values):
+        self.operator = operator
+        super().__init__(*columns, *[Value(value) for value in values])
+
+    def as_sql(self, compiler, connection, **extra_context):
+        compiled = [compiler.compile(expression) for expression in self.source_expressions]
+        half = len(compiled) // 2
+        columns = ", ".join(sql for sql, _ in compiled[:half])
+        values = ", ".join(sql for sql, _ in compiled[half:])
+        params = [param for _, expression_params in compiled for param in expression_params]
+        return f"({columns}) {self.operator} ({values})", params
+
+
+class StandardPagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks past the last row of the previous page
+    using the queryset's ordering plus an ``id`` tiebreaker, so every page
+    costs the same as the first (no COUNT, no OFFSET).
+    """
+
+    cursor_query_param = "cursor"
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    default_ordering = ("-created_at",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        ordering = self.get_ordering(queryset)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            position = self.parse_position(queryset, ordering, position)
+            try:
+                queryset = queryset.filter(self.seek_filter(ordering, position))
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+
+        order_by = [f"-{name}" if desc else name for name, desc in ordering]
+        page = list(queryset.order_by(*order_by)[: self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        page = page[: self.page_size]
+        self.next_position = (
+            [self.encode_value(getattr(page[-1], name)) for name, _ in ordering]
+            if self.has_next
+            else None
+        )
+        return page
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [("next", self.get_next_link()), ("previous", None), ("results", data)]
+            )
+        )
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, queryset):
+        """[(field, descending), ...] ending with an ``id`` tiebreaker."""
+        ordering = [
+            (name.lstrip("-"), name.startswith("-"))
+            for name in (queryset.query.order_by or self.default_ordering)
+        ]
+        if ordering[-1][0] not in ("id", "pk"):
+            ordering.append(("id", ordering[-1][1]))
+        return ordering
+
+    def get_field(self, queryset, name):
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+        if name == "pk":
+            return queryset.model._meta.pk
+        return queryset.model._meta.get_field(name)
+
+    def parse_position(self, queryset, ordering, position):
+        """
+        The cursor's values converted by their ordering fields, so a forged
+        or stale cursor is a 404 rather than a database error.
+        """
+        if len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        values = []
+        for (name, _), value in zip(ordering, position):
+            if value is None or isinstance(value, (list, dict)):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                value = self.get_field(queryset, name).to_python(value)
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+            values.append(value)
+        return values
+
+    def seek_filter(self, ordering, position):
+        directions = {desc for _, desc in ordering}
+        if len(directions) == 1:
+            # (a, b, id) < (x, y, z): a single range on the composite index
+            return RowComparison(
+                [F(name) for name, _ in ordering],
+                "<" if directions.pop() else ">",
+                position,
+            )
+        # mixed directions cannot be one row comparison: expand it, and bound
+        # the leading key so the index is still scanned as a range
+        first, first_desc = ordering[0]
+        condition = Q()
+        for index, (name, desc) in enumerate(ordering):
+            step = Q(**{f"{name}__{'lt' if desc else 'gt'}": position[index]})
+            for earlier, (previous, _) in enumerate(ordering[:index]):
+                step &= Q(**{previous: position[earlier]})
+            condition |= step
+        return Q(**{f"{first}__{'lte' if first_desc else 'gte'}": position[0]}) & condition
+
+    def encode_value(self, value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (binascii.Error, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(self.next_position).encode()
+        ).decode()
+        url = remove_query_param(self.request.build_absolute_uri(), "page")
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+
+class ItemPagination(StandardPagination):
+    """
+    Page numbers by default; passing ``?cursor=`` (empty for the first page)
+    switches item listings to keyset pagination for infinite scroll.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if KeysetPagination.cursor_query_param in request.query_params:
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
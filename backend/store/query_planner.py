@@ -0,0 +1,172 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+class QueryPlan:
+    """
+    Columns, joins and prefetches needed to render one serializer level.
+
+    ``only``/``related`` are lookups relative to this level's model
+    (``category__name``); ``prefetches`` maps a lookup to the plan of the
+    related model's queryset; ``full`` holds lookups ("" for this model)
+    whose columns are read in ways the planner cannot see, so they are
+    loaded in full.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.only = set()
+        self.related = set()
+        self.prefetches = {}
+        self.full = set()
+
+    def add_path(self, path, prefix="", model=None):
+        """
+        Record what reading ``path`` (``a__b__c``, relative to ``prefix``,
+        which reaches ``model``) needs. Returns ``(plan, prefix, model)``
+        for where a nested serializer on that path collects its own fields,
+        or ``None`` if the path does not end on a relation.
+        """
+        plan, model = self, model or self.model
+        parts = path.split("__")
+        for index, part in enumerate(parts):
+            last = index == len(parts) - 1
+            try:
+                model_field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                # a property or method; it may read any column
+                plan.full.add(prefix[:-2])
+                return None
+            lookup = prefix + part
+            if not model_field.is_relation:
+                plan.only.add(lookup)
+                if not last:
+                    plan.full.add(prefix[:-2])
+                return None
+            model = model_field.related_model
+            if model_field.many_to_many or not model_field.concrete:
+                # reverse and many-to-many relations: one query per level
+                sub = plan.prefetches.get(lookup)
+                if sub is None:
+                    sub = plan.prefetches[lookup] = QueryPlan(model)
+                    if not model_field.many_to_many:
+                        # the foreign key prefetching joins back on
+                        sub.only.add(model_field.field.name)
+                plan, prefix = sub, ""
+                continue
+            plan.only.add(lookup)
+            if not last:
+                plan.related.add(lookup)
+            prefix = lookup + "__"
+        return plan, prefix, model
+
+    def get_only(self):
+        if "" in self.full:
+            return None
+        only = {
+            lookup
+            for lookup in self.only
+            if not any(lookup.startswith(full + "__") for full in self.full)
+        }
+        return only | self.full
+
+    def apply(self, queryset):
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if self.related:
+            # select_related() with no arguments would follow every relation
+            queryset = queryset.select_related(*self.related)
+        for lookup, plan in sorted(self.prefetches.items()):
+            related = plan.apply(plan.model._default_manager.all())
+            queryset = queryset.prefetch_related(Prefetch(lookup, queryset=related))
+        only = self.get_only()
+        if only is not None:
+            queryset = queryset.only(*only)
+        return queryset
+
+
+def _collect(serializer, plan, prefix, model, depth):
+    dependencies = getattr(serializer, "field_dependencies", {})
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in dependencies:
+            for path in dependencies[name]:
+                plan.add_path(path, prefix, model)
+            continue
+        if field.source == "*":
+            plan.full.add(prefix[:-2])
+            continue
+
+        path = field.source.replace(".", "__")
+        target = plan.add_path(path, prefix, model)
+        if target is None:
+            continue
+        target_plan, target_prefix, target_model = target
+        lookup = target_prefix[:-2]
+
+        if isinstance(field, serializers.ManyRelatedField):
+            field = field.child_relation
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+
+        if isinstance(nested, serializers.PrimaryKeyRelatedField):
+            # rendered from the foreign key column alone
+            continue
+        if isinstance(nested, serializers.RelatedField):
+            # e.g. StringRelatedField: needs the whole related row
+            if lookup:
+                target_plan.related.add(lookup)
+            target_plan.full.add(lookup)
+            continue
+        if not isinstance(nested, serializers.BaseSerializer):
+            continue
+        if lookup:
+            target_plan.related.add(lookup)
+        max_depth = getattr(nested, "max_depth", None)
+        if max_depth is not None:
+            # RecursiveField renders the parent serializer one level down
+            if depth <= max_depth:
+                child = type(serializer)(
+                    context={**serializer.context, "depth": depth + 1}
+                )
+                _collect(child, target_plan, target_prefix, target_model, depth + 1)
+            continue
+        _collect(nested, target_plan, target_prefix, target_model, depth)
+
+
+def plan_query(serializer, model):
+    """Build the QueryPlan for rendering ``model`` rows with ``serializer``."""
+    plan = QueryPlan(model)
+    _collect(serializer, plan, "", model, serializer.context.get("depth", 1))
+    return plan
+
+
+def plan_queryset(queryset, serializer):
+    """
+    Replace ``queryset``'s select_related/prefetch_related with exactly
+    what ``serializer`` (after any ``?fields=`` pruning) will render, and
+    load only those columns when every rendered field can be mapped.
+    """
+    plan = plan_query(serializer, queryset.model)
+    # keep sort keys loaded, keyset pagination reads them off the last row
+    for ordering in queryset.query.order_by:
+        if isinstance(ordering, str):
+            name = ordering.lstrip("-")
+            if name not in queryset.query.annotations:
+                plan.add_path(name)
+    return plan.apply(queryset)
+
+
+class QueryPlannerMixin:
+    """
+    View mixin loading what the serializer renders in a constant number of
+    queries. Hooks filter_queryset() so it runs after views' own
+    get_queryset() tweaks.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        return plan_queryset(queryset, self.get_serializer())
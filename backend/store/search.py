@@ -0,0 +1,64 @@
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db.models import F, FloatField, Max
+from django.db.models.functions import Cast
+
+from store.models import Category, Item
+
+SEARCH_CONFIG = "english"
+# trigram matching needs at least this many characters
+AUTOCOMPLETE_MIN_LENGTH = 3
+
+
+def search_items(queryset, term):
+    """
+    Filter items matching ``term`` against the weighted ``search_vector``
+    (name > manufacturer > description) and annotate a ``relevance`` rank.
+    """
+    query = SearchQuery(term, search_type="websearch", config=SEARCH_CONFIG)
+    # ts_rank returns float4; widen it so ranks round-trip exactly through
+    # pagination cursors
+    return queryset.filter(search_vector=query).annotate(
+        relevance=Cast(SearchRank(F("search_vector"), query), FloatField())
+    )
+
+
+def no_suggestions():
+    return {"items": [], "manufacturers": [], "categories": []}
+
+
+def autocomplete(term, limit):
+    """
+    Top suggestions for a (possibly partial or misspelled) term across item
+    names, manufacturers and category names, using the trigram indexes.
+    Terms shorter than AUTOCOMPLETE_MIN_LENGTH get none: no index serves
+    them, so every keystroke would scan the tables.
+    """
+    if len(term) < AUTOCOMPLETE_MIN_LENGTH:
+        return no_suggestions()
+    items = Item.objects.filter(
+        is_active=True, item_name__trigram_word_similar=term
+    ).annotate(score=TrigramWordSimilarity(term, "item_name"))
+    manufacturers = Item.objects.filter(
+        is_active=True, manufacturer__trigram_word_similar=term
+    ).annotate(score=TrigramWordSimilarity(term, "manufacturer"))
+    categories = Category.objects.filter(
+        is_active=True, name__trigram_word_similar=term
+    ).annotate(score=TrigramWordSimilarity(term, "name"))
+
+    items = items.order_by("-score", "item_name").values("id", "item_name")[:limit]
+    manufacturers = (
+        manufacturers.values("manufacturer")
+        .annotate(best=Max("score"))
+        .order_by("-best", "manufacturer")[:limit]
+    )
+    categories = categories.order_by("-score", "name").values("id", "name")[:limit]
+
+    return {
+        "items": [{"id": row["id"], "name": row["item_name"]} for row in items],
+        "manufacturers": [row["manufacturer"] for row in manufacturers],
+        "categories": list(categories),
+    }
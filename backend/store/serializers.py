@@ -2,21 +2,25 @@ from rest_framework import serializers
 from store.models import *
 from accounts.models import Seller
 from django.conf import settings
-import uuid
-import os
-from store.supabase_client import supabase_client, SUPABASE_BUCKET_NAME
+from store.sparse_fields import SparseFieldsMixin
+from store.storage import StorageError, upload_images
+from store.images import variant_urls
+from store.uploads import ALLOWED_IMAGE_TYPES, MAX_FILES_PER_SESSION
 
 
 # ==============================
 # Recursive helper
 # ==============================
 class RecursiveField(serializers.Serializer):
+    # also read by store.query_planner to prefetch every rendered level
+    max_depth = 5
+
     def to_representation(self, value):
         parent_serializer = self.parent.parent.__class__
         depth = self.context.get("depth", 1)
 
         # prevent infinite nesting
-        if depth > 5:  # ⬅️ limit recursion depth here
+        if depth > self.max_depth:  # ⬅️ limit recursion depth here
             return None
 
         serializer = parent_serializer(
@@ -28,8 +32,8 @@ class RecursiveField(serializers.Serializer):
 # ==============================
 # Category Serializer
 # ==============================
-class CategorySerializer(serializers.ModelSerializer):
-    subcategories = RecursiveField(many=True, read_only=True)
+class CategoryNodeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """A single category without its children (used to build tree snapshots)."""
 
     class Meta:
         model = Category
@@ -46,6 +50,20 @@ class CategorySerializer(serializers.ModelSerializer):
             "color",
             "popular_brands",
             "parent",  # parent category
+        ]
+
+    def validate_parent(self, parent):
+        moving = self.instance is not None and parent is not None
+        if moving and self.instance.is_in_subtree(parent.pk):
+            raise serializers.ValidationError(CATEGORY_CYCLE_MESSAGE)
+        return parent
+
+
+class CategorySerializer(CategoryNodeSerializer):
+    subcategories = RecursiveField(many=True, read_only=True)
+
+    class Meta(CategoryNodeSerializer.Meta):
+        fields = CategoryNodeSerializer.Meta.fields + [
             "subcategories",  # recursive children
         ]
 
@@ -53,7 +71,7 @@ class CategorySerializer(serializers.ModelSerializer):
 # ==============================
 # Category Breadcrumb Serializer
 # ==============================
-class CategoryBreadcrumbSerializer(serializers.ModelSerializer):
+class CategoryBreadcrumbSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     parent = serializers.SerializerMethodField()
 
     class Meta:
@@ -61,15 +79,17 @@ class CategoryBreadcrumbSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "parent"]
 
     def get_parent(self, obj):
-        if obj.parent:
-            return CategoryBreadcrumbSerializer(obj.parent).data
-        return None
+        # nest the whole chain (root innermost) from a single ancestor query
+        parent = None
+        for ancestor in obj.get_ancestors().only("id", "name"):
+            parent = {"id": ancestor.id, "name": ancestor.name, "parent": parent}
+        return parent
 
 
 # ==============================
 # Item Serializer
 # ==============================
-class ItemSerializer(serializers.ModelSerializer):
+class ItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     seller = serializers.StringRelatedField(read_only=True)
     category = CategorySerializer(read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(
@@ -90,6 +110,14 @@ class ItemSerializer(serializers.ModelSerializer):
     image_urls = serializers.ListField(
         child=serializers.URLField(), allow_empty=True, read_only=True
     )
+    # model columns read by computed fields (used for ?fields= projections)
+    field_dependencies = {"is_in_stock": ["quantity"]}
+    saving_amount = serializers.DecimalField(
+        max_digits=10, decimal_places=2, read_only=True
+    )
+    percent_off = serializers.DecimalField(
+        max_digits=5, decimal_places=2, read_only=True
+    )
 
     class Meta:
         model = Item
@@ -103,7 +131,11 @@ class ItemSerializer(serializers.ModelSerializer):
             "category_id",
             "quantity",
             "price",
+            "mrp",
+            "saving_amount",
+            "percent_off",
             "image_urls",
+            "image_variants",
             "sku",
             "image",
             "description",
@@ -116,12 +148,24 @@ class ItemSerializer(serializers.ModelSerializer):
         read_only_fields = [
             "id",
             "seller",
+            "saving_amount",
+            "percent_off",
             "created_at",
             "updated_at",
             "is_in_stock",
             "image_urls",
+            "image_variants",
         ]
 
+    def validate(self, attrs):
+        mrp = attrs.get("mrp", getattr(self.instance, "mrp", None))
+        price = attrs.get("price", getattr(self.instance, "price", None))
+        if mrp is not None and price is not None and mrp < price:
+            raise serializers.ValidationError(
+                {"mrp": "MRP cannot be lower than the selling price."}
+            )
+        return attrs
+
     def create(self, validated_data):
         user = self.context["request"].user
         if not hasattr(user, "seller"):
@@ -131,47 +175,151 @@ class ItemSerializer(serializers.ModelSerializer):
         images = validated_data.pop("image", [])
         validated_data.pop("image_urls", None)
 
-        uploaded_image_urls = []
+        # uploaded concurrently to the configured image storage
+        try:
+            image_urls = upload_images(images)
+        except StorageError as e:
+            raise serializers.ValidationError(f"Image upload failed for {e}")
+
+        # saving schedules the image variants (store.signals)
+        return Item.objects.create(
+            seller=user.seller, image_urls=image_urls, **validated_data
+        )
+
+
+# ==============================
+# Direct image upload sessions
+# ==============================
+class ImageUploadFileSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255)
+    content_type = serializers.ChoiceField(choices=list(ALLOWED_IMAGE_TYPES))
+
+
+class ImageUploadSessionSerializer(serializers.Serializer):
+    files = ImageUploadFileSerializer(
+        many=True, allow_empty=False, max_length=MAX_FILES_PER_SESSION
+    )
 
-        if supabase_client and SUPABASE_BUCKET_NAME:
-            for img in images:
-                file_extension = os.path.splitext(img.name)[1]
-                unique_filename = f"{uuid.uuid4()}{file_extension}"
 
-                try:
-                    supabase_client.storage.from_(SUPABASE_BUCKET_NAME).upload(
-                        unique_filename, img.read(), {"content-type": img.content_type}
-                    )
-                    public_url = supabase_client.storage.from_(
-                        SUPABASE_BUCKET_NAME
-                    ).get_public_url(unique_filename)
-                    if public_url:
-                        uploaded_image_urls.append(public_url)
-                except Exception as e:
-                    raise serializers.ValidationError(
-                        f"Image upload failed for {img.name}: {e}"
-                    )
+class ImageUploadCompleteSerializer(serializers.Serializer):
+    session = serializers.CharField()
 
-        # create item
-        item = Item.objects.create(seller=user.seller, **validated_data)
 
-        # save Supabase image URLs if model has field
-        if hasattr(item, "image_urls"):
-            item.image_urls = uploaded_image_urls
-            item.save()
+# ==============================
+# Item Summary Serializer
+# ==============================
+class CategorySummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Category
+        fields = ["id", "name"]
+
+
+class ItemSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Constant-cost item representation for listings and nested contexts:
+    category id/name and seller shop name instead of the recursive category
+    tree. Querysets should select_related("category", "seller").
+    """
+
+    seller = serializers.CharField(source="seller.shop_name", read_only=True)
+    category = CategorySummarySerializer(read_only=True)
+    # first image at listing-card size
+    image = serializers.SerializerMethodField()
+    field_dependencies = {
+        "is_in_stock": ["quantity"],
+        "image": ["image_urls", "image_variants"],
+    }
+    saving_amount = serializers.DecimalField(
+        max_digits=10, decimal_places=2, read_only=True
+    )
+    percent_off = serializers.DecimalField(
+        max_digits=5, decimal_places=2, read_only=True
+    )
+
+    class Meta:
+        model = Item
+        fields = [
+            "id",
+            "seller",
+            "item_name",
+            "item_type",
+            "manufacturer",
+            "category",
+            "quantity",
+            "price",
+            "mrp",
+            "saving_amount",
+            "percent_off",
+            "image_urls",
+            "image",
+            "sku",
+            "description",
+            "is_active",
+            "created_at",
+            "is_in_stock",
+        ]
+        read_only_fields = fields
+
+    def get_image(self, obj):
+        urls = variant_urls(obj, "card")
+        return urls[0] if urls else None
+
+
+# ==============================
+# Seller catalog row Serializer
+# ==============================
+class SellerItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Compact item row for seller dashboards (no nested category tree)."""
+
+    category_name = serializers.CharField(
+        source="category.name", read_only=True, default=None
+    )
+    percent_off = serializers.DecimalField(
+        max_digits=5, decimal_places=2, read_only=True
+    )
+    image = serializers.SerializerMethodField()
+    field_dependencies = {
+        "is_in_stock": ["quantity"],
+        "image": ["image_urls", "image_variants"],
+    }
+
+    class Meta:
+        model = Item
+        fields = [
+            "id",
+            "sku",
+            "item_name",
+            "item_type",
+            "manufacturer",
+            "category",
+            "category_name",
+            "quantity",
+            "price",
+            "mrp",
+            "percent_off",
+            "image",
+            "is_active",
+            "is_in_stock",
+            "updated_at",
+        ]
+        read_only_fields = fields
 
-        return item
+    def get_image(self, obj):
+        # dashboard rows show thumbnails
+        urls = variant_urls(obj, "thumb")
+        return urls[0] if urls else None
 
 
 # ==============================
 # CartItem Serializer
 # ==============================
-class CartItemSerializer(serializers.ModelSerializer):
-    item = ItemSerializer(read_only=True)
+class CartItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    item = ItemSummarySerializer(read_only=True)
     item_id = serializers.PrimaryKeyRelatedField(
         queryset=Item.objects.all(), source="item", write_only=True
     )
     total_price = serializers.SerializerMethodField()
+    field_dependencies = {"total_price": ["quantity", "item__price"]}
 
     class Meta:
         model = CartItem
@@ -191,7 +339,7 @@ class CartItemSerializer(serializers.ModelSerializer):
 # ==============================
 # Cart Serializer
 # ==============================
-class CartSerializer(serializers.ModelSerializer):
+class CartSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
     seller = serializers.StringRelatedField(read_only=True)
     cart_items = CartItemSerializer(many=True, read_only=True)
@@ -249,7 +397,7 @@ class CartSerializer(serializers.ModelSerializer):
 # ==============================
 # OrderUser Serializer
 # ==============================
-class OrderUserSerializer(serializers.ModelSerializer):
+class OrderUserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
 
     class Meta:
@@ -293,13 +441,14 @@ class OrderUserSerializer(serializers.ModelSerializer):
 # ==============================
 # OrderItem Serializer
 # ==============================
-class OrderItemSerializer(serializers.ModelSerializer):
+class OrderItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     seller = serializers.StringRelatedField(read_only=True)
-    original_item = ItemSerializer(read_only=True)
+    original_item = ItemSummarySerializer(read_only=True)
     original_item_id = serializers.PrimaryKeyRelatedField(
         queryset=Item.objects.all(), source="original_item", write_only=True
     )
     total_price = serializers.SerializerMethodField()
+    field_dependencies = {"total_price": ["quantity", "price"]}
 
     class Meta:
         model = OrderItem
@@ -331,8 +480,8 @@ class OrderItemSerializer(serializers.ModelSerializer):
 # ==============================
 # SavedForLater Serializer
 # ==============================
-class SavedForLaterSerializer(serializers.ModelSerializer):
-    item = ItemSerializer(read_only=True)
+class SavedForLaterSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    item = ItemSummarySerializer(read_only=True)
     item_id = serializers.PrimaryKeyRelatedField(
         queryset=Item.objects.all(), source="item", write_only=True
     )
@@ -353,7 +502,7 @@ class SavedForLaterSerializer(serializers.ModelSerializer):
 # ==============================
 # Order Serializer
 # ==============================
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     order_user = OrderUserSerializer(read_only=True)
     order_user_id = serializers.PrimaryKeyRelatedField(
         queryset=OrderUser.objects.all(), source="order_user", write_only=True
@@ -365,6 +514,7 @@ class OrderSerializer(serializers.ModelSerializer):
         source="order_items",
         write_only=True,
     )
+    field_dependencies = {"is_active": ["status"]}
 
     class Meta:
         model = Order
@@ -0,0 +1,52 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from accounts.models import Seller
+from store.cache import (
+    CATEGORY_TREE_VERSION,
+    bump_version,
+    invalidate_catalog,
+    invalidate_item,
+)
+from store.images import schedule_item_variants
+from store.models import Category, Item
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_tree(sender, **kwargs):
+    # after commit, or a concurrent request could cache the old tree under
+    # the new version
+    transaction.on_commit(lambda: bump_version(CATEGORY_TREE_VERSION))
+
+
+@receiver(post_delete, sender=Category)
+def invalidate_uncategorized_items(sender, **kwargs):
+    # its items were moved to no category by a queryset update
+    invalidate_catalog()
+
+
+# Item deliberately has no delete receivers: any would stop cascades and
+# queryset deletes from using Django's fast path and load every row.
+# Item.delete() invalidates single deletes; the rest invalidate the catalog.
+@receiver(pre_delete, sender=Seller)
+def invalidate_seller_items(sender, **kwargs):
+    invalidate_catalog()
+
+
+@receiver(post_save, sender=Item)
+def invalidate_item_responses(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # an item moved to another category leaves the old category's listings too
+    previous = getattr(instance, "_loaded_category_id", None)
+    invalidate_item(instance.pk, instance.category_id, previous)
+    instance._loaded_category_id = instance.category_id
+
+
+@receiver(post_save, sender=Item)
+def rebuild_image_variants(sender, instance, raw=False, **kwargs):
+    if not raw and getattr(instance, "_images_changed", False) and instance.image_urls:
+        schedule_item_variants(
+            instance.pk, getattr(instance, "_unverified_image_urls", ())
+        )
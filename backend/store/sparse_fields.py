@@ -0,0 +1,84 @@
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def parse_field_spec(value):
+    """
+    Turn ``"id,category.name,order_items"`` into a nested dict,
+    ``{"id": {}, "category": {"name": {}}, "order_items": {}}``.
+    """
+    tree = {}
+    for path in value.split(","):
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        for part in path.split("."):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def get_request_field_spec(request):
+    """``(fields, expand)`` trees for a read request, or ``None``."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    params = request.query_params
+    if FIELDS_PARAM not in params and EXPAND_PARAM not in params:
+        return None
+    fields = params.get(FIELDS_PARAM)
+    return (
+        parse_field_spec(fields) if fields else None,
+        parse_field_spec(params.get(EXPAND_PARAM, "")),
+    )
+
+
+class SparseFieldsMixin:
+    """
+    Lets read requests choose what is rendered:
+
+    ``?fields=id,item_name,category.name`` keeps only the listed fields
+    (dotted names reach into nested serializers). Nested objects that are
+    requested without sub-fields collapse to their primary key unless they
+    are also listed in ``?expand=``. Without ``fields`` the full
+    representation is rendered as before.
+    """
+
+    # set by the parent serializer for nested levels
+    sparse_spec = None
+
+    def get_sparse_spec(self):
+        if self.sparse_spec is not None:
+            return self.sparse_spec
+        # the top-level serializer (or the child of a top-level many=True)
+        top = self.parent if isinstance(self.parent, serializers.ListSerializer) else self
+        if top.parent is None:
+            return get_request_field_spec(self.context.get("request"))
+        return None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        spec = self.get_sparse_spec()
+        if spec is None:
+            return fields
+        only, expand = spec
+
+        if only is not None:
+            fields = {name: field for name, field in fields.items() if name in only}
+
+        for name, field in list(fields.items()):
+            many = isinstance(field, serializers.ListSerializer)
+            nested = field.child if many else field
+            if not isinstance(nested, serializers.BaseSerializer):
+                continue
+            sub_only = only.get(name) or None if only is not None else None
+            if only is not None and sub_only is None and name not in expand:
+                # render the relation as primary key(s) instead of an object
+                fields[name] = serializers.PrimaryKeyRelatedField(
+                    source=field.source, many=many, read_only=True
+                )
+            elif isinstance(nested, SparseFieldsMixin):
+                nested.sparse_spec = (sub_only, expand.get(name, {}))
+        return fields
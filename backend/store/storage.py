@@ -0,0 +1,269 @@
+"""
+Item image storage.
+
+IMAGE_STORAGE_BACKEND picks where uploads go:
+
+- "supabase": the SUPABASE_BUCKET_NAME bucket, through the process-wide
+  client in store.supabase_client (one pooled HTTP/2 connection set per
+  worker, shared by all upload threads).
+- "django": Django's default file storage, i.e. MEDIA_ROOT on disk unless
+  STORAGES points it at S3-compatible storage via django-storages. Useful
+  offline and in development.
+
+Uploads of one request run concurrently on a bounded, per-process thread
+pool, and file bodies are streamed from Django's temporary upload files
+instead of being read into memory. Derived image sizes are built by
+store.images.
+"""
+
+import os
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import storages
+from django.urls import reverse
+
+from backend.metrics import track_outbound
+
+
+LOCAL_UPLOAD_SALT = "store.storage.local-upload"
+
+
+class StorageError(Exception):
+    pass
+
+
+class ImageStorage(ABC):
+    name = None
+
+    @abstractmethod
+    def save(self, path, fileobj, content_type):
+        """Store ``fileobj`` at ``path`` and return its public URL."""
+
+    @abstractmethod
+    def delete(self, paths):
+        """Remove stored paths."""
+
+    @abstractmethod
+    def path_for_url(self, url):
+        """The storage path behind a URL save() returned, or None for other URLs."""
+
+    @abstractmethod
+    def read(self, path):
+        """The bytes stored at ``path``."""
+
+    @abstractmethod
+    def url(self, path):
+        """Public URL of a stored path."""
+
+    @abstractmethod
+    def exists(self, path):
+        """Whether ``path`` is stored."""
+
+    @abstractmethod
+    def stat(self, path):
+        """
+        ``{"size", "content_type"}`` of a stored path (content_type is None
+        when the backend does not record one), or None when it is missing.
+        """
+
+    @abstractmethod
+    def create_upload_url(self, path, content_type):
+        """
+        Where a client can upload ``path`` without going through the API:
+        ``{"url", "method", "headers"}``.
+        """
+
+
+class SupabaseImageStorage(ImageStorage):
+    name = "supabase"
+
+    def __init__(self, client, bucket):
+        self.bucket = client.storage.from_(bucket)
+        # public URLs are "<prefix><path>?"; derive the prefix from a dummy path
+        self.public_prefix = self.bucket.get_public_url("_").split("?", 1)[0][:-1]
+
+    def save(self, path, fileobj, content_type):
+        options = {"content-type": content_type, "upsert": "true"}
+        # upsert so rebuilt image variants can replace their earlier copies
+        if hasattr(fileobj, "temporary_file_path"):
+            # large uploads are streamed from their temporary file, which
+            # the Supabase client would never close
+            with open(fileobj.temporary_file_path(), "rb") as body:
+                self.bucket.upload(path, body, options)
+        else:
+            fileobj.seek(0)
+            self.bucket.upload(path, fileobj.read(), options)
+        return self.bucket.get_public_url(path)
+
+    def delete(self, paths):
+        self.bucket.remove(list(paths))
+
+    def path_for_url(self, url):
+        if not url.startswith(self.public_prefix):
+            return None
+        return url[len(self.public_prefix):].split("?", 1)[0]
+
+    def read(self, path):
+        return self.bucket.download(path)
+
+    def url(self, path):
+        return self.bucket.get_public_url(path)
+
+    def exists(self, path):
+        try:
+            return self.bucket.exists(path)
+        except Exception:
+            # storage3 raises on 404
+            return False
+
+    def stat(self, path):
+        try:
+            info = self.bucket.info(path)
+        except Exception:
+            return None
+        if isinstance(info, list):
+            info = info[0] if info else {}
+        metadata = info.get("metadata") or {}
+        return {
+            "size": info.get("size", metadata.get("size")),
+            "content_type": info.get("content_type", metadata.get("mimetype")),
+        }
+
+    def create_upload_url(self, path, content_type):
+        signed = self.bucket.create_signed_upload_url(path)
+        return {
+            "url": signed["signed_url"],
+            "method": "PUT",
+            "headers": {"content-type": content_type},
+        }
+
+
+class DjangoImageStorage(ImageStorage):
+    name = "django"
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    def save(self, path, fileobj, content_type):
+        # Storage.save() copies the file in chunks
+        saved = self.storage.save(path, fileobj)
+        return self.storage.url(saved)
+
+    def delete(self, paths):
+        for path in paths:
+            self.storage.delete(path)
+
+    def path_for_url(self, url):
+        base_url = self.storage.base_url
+        if not url.startswith(base_url):
+            return None
+        return url[len(base_url):]
+
+    def read(self, path):
+        with self.storage.open(path, "rb") as fileobj:
+            return fileobj.read()
+
+    def url(self, path):
+        return self.storage.url(path)
+
+    def exists(self, path):
+        return self.storage.exists(path)
+
+    def stat(self, path):
+        if not self.storage.exists(path):
+            return None
+        return {"size": self.storage.size(path), "content_type": None}
+
+    def create_upload_url(self, path, content_type):
+        # no presigning for arbitrary Django storages: a signed, expiring
+        # token for LocalUploadAPIView stands in (development/offline use)
+        token = signing.dumps(
+            {"path": path, "content_type": content_type}, salt=LOCAL_UPLOAD_SALT
+        )
+        return {
+            "url": reverse("local-upload", kwargs={"token": token}),
+            "method": "PUT",
+            "headers": {"content-type": content_type},
+        }
+
+
+@lru_cache(maxsize=None)
+def get_image_storage():
+    """The configured ImageStorage, or None when Supabase is not set up."""
+    backend = getattr(settings, "IMAGE_STORAGE_BACKEND", "supabase")
+    if backend == "supabase":
+        from store.supabase_client import SUPABASE_BUCKET_NAME, supabase_client
+
+        if not (supabase_client and SUPABASE_BUCKET_NAME):
+            return None
+        return SupabaseImageStorage(supabase_client, SUPABASE_BUCKET_NAME)
+    if backend == "django":
+        return DjangoImageStorage(storages["default"])
+    raise ImproperlyConfigured(f"Unknown IMAGE_STORAGE_BACKEND '{backend}'")
+
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name, max_workers):
+    """
+    A named per-process thread pool, created on first use so that forked
+    workers each get their own threads.
+    """
+    with _executors_lock:
+        if name not in _executors:
+            _executors[name] = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=name
+            )
+        return _executors[name]
+
+
+def image_path(filename, prefix="items"):
+    return f"{prefix}/{uuid.uuid4()}{os.path.splitext(filename)[1].lower()}"
+
+
+def upload_images(files, prefix="items"):
+    """
+    Upload Django UploadedFiles concurrently and return their public URLs in
+    the order given. If any upload fails the others are removed again and
+    StorageError is raised; with no storage configured nothing is uploaded.
+    """
+    storage = get_image_storage()
+    if storage is None or not files:
+        return []
+
+    def upload(path, fileobj):
+        with track_outbound(storage.name, "upload"):
+            return storage.save(path, fileobj, fileobj.content_type)
+
+    paths = [image_path(fileobj.name, prefix) for fileobj in files]
+    executor = get_executor(
+        "image-upload", getattr(settings, "IMAGE_UPLOAD_WORKERS", 4)
+    )
+    futures = [
+        executor.submit(upload, path, fileobj) for path, fileobj in zip(paths, files)
+    ]
+    urls, failures = [], []
+    for path, fileobj, future in zip(paths, files, futures):
+        try:
+            urls.append(future.result())
+        except Exception as e:
+            failures.append(f"{fileobj.name}: {e}")
+    if failures:
+        uploaded = [path for path, future in zip(paths, futures) if not future.exception()]
+        if uploaded:
+            try:
+                with track_outbound(storage.name, "delete"):
+                    storage.delete(uploaded)
+            except Exception:
+                pass
+        raise StorageError("; ".join(failures))
+    return urls
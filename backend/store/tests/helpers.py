@@ -0,0 +1,32 @@
+from decimal import Decimal
+from itertools import count
+
+from accounts.models import Seller, User
+from store.models import Item
+
+_sequence = count(1)
+
+# a private in-process cache for tests that count hits and versions
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def make_seller(shop_name="Test Shop"):
+    number = next(_sequence)
+    user = User.objects.create_user(
+        email=f"seller-{number}@example.com", password="x", is_active=True
+    )
+    return Seller.objects.create(user=user, shop_name=shop_name)
+
+
+def make_item(seller, **fields):
+    number = next(_sequence)
+    values = {
+        "item_name": f"Item {number}",
+        "item_type": "grocery",
+        "manufacturer": "Acme",
+        "quantity": 10,
+        "price": Decimal("10.00"),
+        "sku": f"TEST-{number}",
+    }
+    values.update(fields)
+    return Item.objects.create(seller=seller, **values)
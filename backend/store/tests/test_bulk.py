@@ -0,0 +1,194 @@
+import io
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from store.bulk import ImportFileError, ItemImporter, bulk_update_items, import_items
+from store.models import Item
+from store.tests.helpers import make_item, make_seller
+
+HEADER = "sku,item_name,item_type,manufacturer,quantity,price\n"
+
+
+def csv_file(*rows):
+    return io.BytesIO((HEADER + "".join(f"{row}\n" for row in rows)).encode())
+
+
+class ItemImportTests(TestCase):
+    def setUp(self):
+        self.seller = make_seller()
+
+    def test_sku_taken_between_recheck_and_insert_is_reported(self):
+        importer = ItemImporter(self.seller)
+        accepted = [
+            (2, {"sku": "A", "item_name": "A", "item_type": "t", "manufacturer": "m", "quantity": 1, "price": 1}),
+            (3, {"sku": "B", "item_name": "B", "item_type": "t", "manufacturer": "m", "quantity": 1, "price": 1}),
+        ]
+        make_item(make_seller(), sku="B")
+        # the re-check misses B, as if it was inserted right after the query
+        with mock.patch.object(Item.objects, "filter") as recheck:
+            recheck.return_value.values_list.return_value = []
+            importer.retry_conflicts(accepted)
+
+        self.assertEqual(importer.report["created"], 1)
+        self.assertEqual(importer.report["failed"], 1)
+        self.assertEqual(importer.report["errors"][0]["sku"], "B")
+        self.assertTrue(Item.objects.filter(sku="A", seller=self.seller).exists())
+
+    def test_file_error_reports_rows_already_imported(self):
+        fileobj = io.BytesIO(
+            (HEADER + "A,Apple,fruit,Farm,1,2.00\n").encode() + b"B,\xff\xfe,fruit,Farm,1,2.00\n"
+        )
+        with self.assertRaises(ImportFileError) as raised:
+            import_items(self.seller, fileobj, "csv", batch_size=1)
+
+        self.assertEqual(raised.exception.report["created"], 1)
+        self.assertTrue(Item.objects.filter(sku="A").exists())
+
+
+class CatalogSyncTests(TestCase):
+    def setUp(self):
+        self.seller = make_seller()
+        self.kept = make_item(self.seller, sku="KEEP", item_name="Kept", price="5.00")
+        self.changed = make_item(self.seller, sku="CHANGE", item_name="Changed", price="5.00")
+        self.missing = make_item(self.seller, sku="GONE", item_name="Gone", price="5.00")
+        self.other_shop = make_item(make_seller(), sku="OTHER")
+
+    def sync(self, fileobj, **options):
+        return import_items(self.seller, fileobj, "csv", sync=True, **options)
+
+    def test_counts_unchanged_updated_created_and_deactivated(self):
+        report = self.sync(
+            csv_file(
+                "KEEP,Kept,grocery,Acme,10,5.00",
+                "CHANGE,Changed,grocery,Acme,10,6.50",
+                "NEW,New,grocery,Acme,3,1.00",
+            )
+        )
+
+        self.assertEqual(
+            {name: report[name] for name in ("rows", "created", "updated", "unchanged", "deactivated", "failed")},
+            {"rows": 3, "created": 1, "updated": 1, "unchanged": 1, "deactivated": 1, "failed": 0},
+        )
+        self.changed.refresh_from_db()
+        self.missing.refresh_from_db()
+        self.other_shop.refresh_from_db()
+        self.assertEqual(str(self.changed.price), "6.50")
+        self.assertEqual(self.changed.content_hash, self.changed.compute_content_hash())
+        self.assertFalse(self.missing.is_active)
+        self.assertTrue(self.other_shop.is_active)
+        self.assertTrue(Item.objects.filter(sku="NEW", seller=self.seller).exists())
+
+    def test_numeric_jsonl_skus_are_not_deactivated(self):
+        numeric = make_item(self.seller, sku="12345", item_name="Numeric", price="5.00")
+        feed = io.BytesIO(
+            b'{"sku": 12345, "item_name": "Numeric", "item_type": "grocery",'
+            b' "manufacturer": "Acme", "quantity": 10, "price": "7.00"}\n'
+        )
+
+        report = import_items(self.seller, feed, "jsonl", sync=True)
+
+        numeric.refresh_from_db()
+        self.assertEqual((report["updated"], report["failed"]), (1, 0))
+        self.assertTrue(numeric.is_active)
+        self.assertEqual(str(numeric.price), "7.00")
+
+    def test_resync_of_the_same_feed_changes_nothing(self):
+        feed = ("KEEP,Kept,grocery,Acme,10,5.00", "CHANGE,Changed,grocery,Acme,10,6.50")
+        self.sync(csv_file(*feed))
+        report = self.sync(csv_file(*feed))
+
+        self.assertEqual((report["updated"], report["unchanged"], report["deactivated"]), (0, 2, 0))
+
+    def test_dry_run_writes_nothing(self):
+        report = self.sync(csv_file("KEEP,Kept,grocery,Acme,10,9.00"), dry_run=True)
+
+        self.assertEqual((report["updated"], report["deactivated"]), (1, 2))
+        self.kept.refresh_from_db()
+        self.assertEqual(str(self.kept.price), "5.00")
+        self.assertEqual(Item.objects.filter(seller=self.seller, is_active=True).count(), 3)
+
+    def test_empty_feed_deactivates_nothing(self):
+        report = self.sync(csv_file())
+
+        self.assertEqual((report["rows"], report["deactivated"]), (0, 0))
+        self.assertEqual(Item.objects.filter(seller=self.seller, is_active=True).count(), 3)
+
+    def test_invalid_rows_keep_their_items_active(self):
+        report = self.sync(csv_file("KEEP,Kept,grocery,Acme,10,5.00", "CHANGE,Changed,grocery,Acme,-1,5.00"))
+
+        self.assertEqual((report["failed"], report["deactivated"]), (1, 1))
+        self.changed.refresh_from_db()
+        self.assertTrue(self.changed.is_active)
+
+
+class BulkUpdateItemsTests(TestCase):
+    def setUp(self):
+        self.seller = make_seller()
+        self.apple = make_item(
+            self.seller, sku="APPLE", price="5.00", mrp="6.00", quantity=1
+        )
+        self.pear = make_item(self.seller, sku="PEAR", price="3.00", quantity=2)
+        self.foreign = make_item(make_seller(), sku="FOREIGN", price="9.00")
+
+    def test_mixed_id_and_sku_addressing_and_counts(self):
+        with CaptureQueriesContext(connection) as queries:
+            report = bulk_update_items(
+                self.seller,
+                [
+                    {"id": self.apple.pk, "price": "5.50"},
+                    {"sku": "PEAR", "quantity": 2},
+                    {"sku": "PEAR", "quantity": 7},
+                    {"price": "1.00"},
+                ],
+            )
+
+        self.assertEqual(
+            {name: report[name] for name in ("rows", "updated", "unchanged", "failed")},
+            {"rows": 4, "updated": 1, "unchanged": 1, "failed": 2},
+        )
+        self.assertEqual([error["row"] for error in report["errors"]], [2, 3])
+        # the rows are locked while the new content_hash is computed
+        self.assertTrue(any("FOR UPDATE" in query["sql"] for query in queries))
+        self.apple.refresh_from_db()
+        self.assertEqual(str(self.apple.price), "5.50")
+        self.assertEqual(self.apple.content_hash, self.apple.compute_content_hash())
+
+    def test_other_sellers_items_are_not_found(self):
+        report = bulk_update_items(
+            self.seller,
+            [{"id": self.foreign.pk, "price": "1.00"}, {"sku": "FOREIGN", "quantity": 0}],
+        )
+
+        self.assertEqual((report["updated"], report["failed"]), (0, 2))
+        self.assertEqual(
+            {str(error["errors"]["non_field_errors"][0]) for error in report["errors"]},
+            {"Item not found."},
+        )
+        self.foreign.refresh_from_db()
+        self.assertEqual((str(self.foreign.price), self.foreign.quantity), ("9.00", 10))
+
+    def test_price_above_mrp_is_rejected(self):
+        report = bulk_update_items(self.seller, [{"sku": "APPLE", "price": "6.50"}])
+
+        self.assertEqual(report["failed"], 1)
+        self.assertIn("price", report["errors"][0]["errors"])
+        self.apple.refresh_from_db()
+        self.assertEqual(str(self.apple.price), "5.00")
+
+    def test_endpoint_is_for_sellers_only(self):
+        client = APIClient()
+        buyer = User.objects.create_user(email="buyer@example.com", password="x")
+        client.force_authenticate(buyer)
+        body = {"items": [{"sku": "APPLE", "quantity": 0}]}
+
+        response = client.patch("/api/store/items/bulk-update/", body, format="json")
+        self.assertEqual(response.status_code, 403)
+
+        client.force_authenticate(self.seller.user)
+        response = client.patch("/api/store/items/bulk-update/", body, format="json")
+        self.assertEqual((response.status_code, response.data["updated"]), (200, 1))
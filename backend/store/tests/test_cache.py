@@ -0,0 +1,215 @@
+import io
+from unittest import mock
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, pre_delete
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from store.bulk import import_items
+from store.cache import get_or_compute
+from store.models import Category, Item
+from store.tests.helpers import LOCMEM, make_item, make_seller
+
+
+@override_settings(CACHES=LOCMEM)
+class ResponseCacheInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.seller = make_seller()
+        self.fruit = Category.objects.create(name="Fruit")
+        self.dairy = Category.objects.create(name="Dairy")
+        self.item = make_item(self.seller, sku="APPLE", category=self.fruit)
+        self.client = APIClient()
+        self.client.force_authenticate(self.seller.user)
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assert_cached(self, url):
+        self.get(url)
+        self.assertEqual(self.get(url)["X-Cache"], "HIT")
+
+    def test_price_and_stock_saves_retire_listing_and_detail(self):
+        urls = [
+            "/api/store/new-items/",
+            f"/api/store/new-items/{self.item.pk}/",
+            f"/api/store/categories/{self.fruit.pk}/items/",
+        ]
+        for url in urls:
+            self.assert_cached(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.price = 7
+            self.item.quantity = 0
+            self.item.save(update_fields=["price", "quantity"])
+
+        for url in urls:
+            response = self.get(url)
+            self.assertEqual(response["X-Cache"], "MISS", url)
+        self.assertEqual(self.get(urls[1]).json()["quantity"], 0)
+
+    def test_moving_an_item_retires_both_category_listings(self):
+        old, new = (
+            f"/api/store/categories/{self.fruit.pk}/items/",
+            f"/api/store/categories/{self.dairy.pk}/items/",
+        )
+        self.assert_cached(old)
+        self.assert_cached(new)
+
+        item = Item.objects.get(pk=self.item.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            item.category = self.dairy
+            item.save()
+
+        self.assertEqual(self.get(old)["X-Cache"], "MISS")
+        self.assertEqual(self.get(new)["X-Cache"], "MISS")
+        self.assertEqual(self.get(old).json()["results"], [])
+
+    def test_bulk_import_retires_listings(self):
+        self.assert_cached("/api/store/new-items/")
+        feed = "sku,item_name,item_type,manufacturer,quantity,price\nPEAR,Pear,grocery,Acme,5,3.00\n"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            import_items(self.seller, io.BytesIO(feed.encode()), "csv")
+
+        response = self.get("/api/store/new-items/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertIn("PEAR", response.content.decode())
+
+    def test_deletes_retire_listings_without_item_delete_receivers(self):
+        self.assertFalse(pre_delete.has_listeners(Item))
+        self.assertFalse(post_delete.has_listeners(Item))
+        self.assert_cached("/api/store/new-items/")
+        with self.captureOnCommitCallbacks(execute=True):
+            Item.objects.get(pk=self.item.pk).delete()
+        self.assertEqual(self.get("/api/store/new-items/")["X-Cache"], "MISS")
+
+        other = make_seller()
+        make_item(other)
+        self.assert_cached("/api/store/new-items/")
+        with self.captureOnCommitCallbacks(execute=True):
+            other.user.delete()
+        self.assertEqual(self.get("/api/store/new-items/")["X-Cache"], "MISS")
+
+
+@override_settings(CACHES=LOCMEM, CACHE_STALE_GRACE=60, CACHE_LOCK_TIMEOUT=10)
+class GetOrComputeTests(SimpleTestCase):
+    KEY = "test:key"
+    LOCK = "test:key:lock"
+
+    def setUp(self):
+        cache.clear()
+        patches = {
+            "time": mock.patch("store.cache.time"),
+            "random": mock.patch("store.cache.random"),
+            "record": mock.patch("store.cache.record_cache_lookup"),
+        }
+        for name, patcher in patches.items():
+            setattr(self, name, patcher.start())
+            self.addCleanup(patcher.stop)
+        self.time.time.return_value = 1000.0
+        # no early (XFetch) refresh unless a test asks for one
+        self.random.random.return_value = 0.0
+        self.compute = mock.Mock(return_value="fresh")
+
+    def get(self, timeout=10):
+        return get_or_compute(self.KEY, self.compute, timeout, name="test")
+
+    def results(self):
+        return [call.args[1] for call in self.record.call_args_list]
+
+    def test_timeout_zero_computes_every_time_without_caching(self):
+        self.assertEqual(self.get(timeout=0), "fresh")
+        self.assertEqual(self.get(timeout=0), "fresh")
+
+        self.assertEqual(self.compute.call_count, 2)
+        self.assertIsNone(cache.get(self.KEY))
+        self.record.assert_not_called()
+
+    def test_fresh_entry_is_a_hit(self):
+        self.get()
+        self.time.time.return_value = 1009.0
+
+        self.assertEqual(self.get(), "fresh")
+        self.compute.assert_called_once()
+        self.assertEqual(self.results(), ["miss", "hit"])
+        self.assertIsNone(cache.get(self.LOCK))
+
+    def test_entry_near_expiry_can_be_refreshed_early(self):
+        # lookup, compute start and end: the first compute took 2s of 10
+        self.time.time.side_effect = [1000.0, 1000.0, 1002.0, 1009.0, 1009.0, 1010.0]
+        self.get()
+        self.random.random.return_value = 0.99
+        self.compute.return_value = "refreshed"
+
+        self.assertEqual(self.get(), "refreshed")
+        self.assertEqual(self.results(), ["miss", "miss"])
+
+    def test_expired_entry_is_served_stale_while_another_worker_recomputes(self):
+        self.get()
+        self.time.time.return_value = 1011.0
+        cache.add(self.LOCK, "other-worker")
+
+        self.assertEqual(self.get(), "fresh")
+        self.compute.assert_called_once()
+        self.assertEqual(self.results(), ["miss", "stale"])
+
+    def test_expired_entry_is_recomputed_by_the_lock_holder(self):
+        self.get()
+        self.time.time.return_value = 1011.0
+        self.compute.return_value = "recomputed"
+
+        self.assertEqual(self.get(), "recomputed")
+        self.assertEqual(cache.get(self.KEY)["value"], "recomputed")
+        self.assertIsNone(cache.get(self.LOCK))
+
+    def test_a_lock_taken_over_after_expiry_is_not_released(self):
+        def slow_compute():
+            # our lock expired and another worker took it meanwhile
+            cache.set(self.LOCK, "other-worker")
+            return "fresh"
+
+        self.compute.side_effect = slow_compute
+        self.get()
+
+        self.assertEqual(cache.get(self.LOCK), "other-worker")
+
+    def test_none_is_returned_but_not_cached(self):
+        self.compute.return_value = None
+
+        self.assertIsNone(self.get())
+        self.assertIsNone(self.get())
+        self.assertEqual(self.compute.call_count, 2)
+        self.assertIsNone(cache.get(self.LOCK))
+
+    def test_miss_waits_for_the_lock_holders_value(self):
+        cache.add(self.LOCK, "other-worker")
+        entry = {"value": "theirs", "expires": 1010.0, "delta": 0.5}
+
+        def sleep(seconds):
+            if self.time.sleep.call_count == 3:
+                cache.set(self.KEY, entry, 70)
+
+        self.time.sleep.side_effect = sleep
+
+        self.assertEqual(self.get(), "theirs")
+        self.compute.assert_not_called()
+        self.assertEqual(self.time.sleep.call_count, 3)
+        self.assertEqual(self.results(), ["hit"])
+
+    def test_miss_takes_over_when_the_lock_is_released_without_a_value(self):
+        cache.add(self.LOCK, "other-worker")
+
+        def sleep(seconds):
+            if self.time.sleep.call_count == 3:
+                cache.delete(self.LOCK)
+
+        self.time.sleep.side_effect = sleep
+
+        self.assertEqual(self.get(), "fresh")
+        self.compute.assert_called_once()
+        self.assertEqual(self.results(), ["miss"])
+        self.assertIsNone(cache.get(self.LOCK))
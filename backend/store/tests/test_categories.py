@@ -0,0 +1,103 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+
+from store.cache import CATEGORY_TREE_VERSION, get_version
+from store.models import Category
+from store.serializers import CategorySerializer
+from store.tests.helpers import LOCMEM
+
+
+class CategoryPathTests(TestCase):
+    def setUp(self):
+        # root -> child -> grandchild, plus a second root
+        self.root = Category.objects.create(name="Root")
+        self.child = Category.objects.create(name="Child", parent=self.root)
+        self.grandchild = Category.objects.create(name="Grandchild", parent=self.child)
+        self.other = Category.objects.create(name="Other")
+
+    def refresh(self, *categories):
+        for category in categories:
+            category.refresh_from_db()
+
+    def test_paths_follow_ancestry(self):
+        self.assertEqual(self.root.path, f"/{self.root.pk}/")
+        self.assertEqual(self.child.path, f"/{self.root.pk}/{self.child.pk}/")
+        self.assertEqual(
+            self.grandchild.path, f"/{self.root.pk}/{self.child.pk}/{self.grandchild.pk}/"
+        )
+        self.assertEqual(
+            [self.root.depth, self.child.depth, self.grandchild.depth], [0, 1, 2]
+        )
+        self.assertEqual(self.grandchild.ancestor_ids, [self.root.pk, self.child.pk, self.grandchild.pk])
+
+    def test_moving_a_subtree_reroots_descendants(self):
+        self.child.parent = self.other
+        self.child.save()
+        self.refresh(self.child, self.grandchild, self.root)
+
+        self.assertEqual(self.child.path, f"/{self.other.pk}/{self.child.pk}/")
+        self.assertEqual(
+            self.grandchild.path, f"/{self.other.pk}/{self.child.pk}/{self.grandchild.pk}/"
+        )
+        self.assertEqual([self.child.depth, self.grandchild.depth], [1, 2])
+        self.assertEqual(self.root.path, f"/{self.root.pk}/")
+        self.assertEqual(
+            list(self.other.get_descendants().order_by("depth")),
+            [self.other, self.child, self.grandchild],
+        )
+
+    def test_moving_a_subtree_to_the_top_level(self):
+        self.child.parent = None
+        self.child.save()
+        self.refresh(self.child, self.grandchild)
+
+        self.assertEqual(self.child.path, f"/{self.child.pk}/")
+        self.assertEqual(self.grandchild.path, f"/{self.child.pk}/{self.grandchild.pk}/")
+        self.assertEqual([self.child.depth, self.grandchild.depth], [0, 1])
+
+    def test_moving_under_own_descendant_is_rejected(self):
+        self.root.parent = self.grandchild
+        with self.assertRaises(ValueError):
+            self.root.save()
+        self.refresh(self.root, self.child, self.grandchild)
+
+        self.assertIsNone(self.root.parent_id)
+        self.assertEqual(self.root.path, f"/{self.root.pk}/")
+        self.assertEqual(
+            self.grandchild.path, f"/{self.root.pk}/{self.child.pk}/{self.grandchild.pk}/"
+        )
+
+    def test_moving_under_itself_is_rejected(self):
+        self.child.parent = self.child
+        with self.assertRaises(ValueError):
+            self.child.save()
+
+    def test_cycles_are_field_errors_in_forms_and_serializers(self):
+        self.root.parent = self.grandchild
+        with self.assertRaises(ValidationError) as raised:
+            self.root.full_clean()
+        self.assertIn("parent", raised.exception.message_dict)
+
+        serializer = CategorySerializer(
+            self.child, data={"parent": self.grandchild.pk}, partial=True
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("parent", serializer.errors)
+
+        self.child.parent = self.other
+        self.child.full_clean()
+        serializer = CategorySerializer(
+            self.child, data={"parent": self.other.pk}, partial=True
+        )
+        self.assertTrue(serializer.is_valid())
+
+
+@override_settings(CACHES=LOCMEM)
+class CategoryTreeVersionTests(TestCase):
+    def test_tree_version_is_bumped_only_once_the_save_commits(self):
+        before = get_version(CATEGORY_TREE_VERSION)
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(name="Fresh")
+            self.assertEqual(get_version(CATEGORY_TREE_VERSION), before)
+
+        self.assertGreater(get_version(CATEGORY_TREE_VERSION), before)
@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from store.bulk import import_items
+from store.exports import EXPORTS, Export, export_response
+from store.models import Category, Order, OrderItem, OrderUser
+from store.tests.helpers import make_item, make_seller
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.seller = make_seller()
+        category = Category.objects.create(name="Fruit")
+        self.items = [
+            make_item(
+                self.seller,
+                category=category if index % 2 else None,
+                price=Decimal("2.50") + index,
+                image_urls=[f"https://img.example.com/{index}.jpg"] * (index % 3),
+                description=f'line, with "quotes" {index}',
+            )
+            for index in range(5)
+        ]
+        make_item(make_seller(), sku="FOREIGN")
+
+    def export(self, dataset, file_format, user=None):
+        with mock.patch("store.exports.FLUSH_ROWS", 2):
+            response = export_response(
+                EXPORTS[dataset], user or self.seller.user, file_format
+            )
+            chunks = list(response.streaming_content)
+        return [chunk.decode() for chunk in chunks]
+
+    def test_export_needs_a_queryset(self):
+        with self.assertRaises(TypeError):
+            type("Incomplete", (Export,), {})()
+
+    def test_csv_round_trips_through_a_sync_import(self):
+        chunks = self.export("items", "csv")
+
+        # header + 5 rows, flushed every 2 rows
+        self.assertEqual(len(chunks), 3)
+        rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+        self.assertEqual([row["sku"] for row in rows], [item.sku for item in self.items])
+        self.assertEqual(rows[0]["description"], 'line, with "quotes" 0')
+        feed = io.BytesIO("".join(chunks).encode())
+        report = import_items(self.seller, feed, "csv", sync=True)
+        self.assertEqual((report["unchanged"], report["updated"], report["failed"]), (5, 0, 0))
+
+    def test_ndjson_round_trips_through_a_sync_import(self):
+        chunks = self.export("items", "ndjson")
+
+        self.assertEqual(len(chunks), 3)
+        rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+        self.assertEqual(rows[1]["image_urls"], ["https://img.example.com/1.jpg"])
+        feed = io.BytesIO("".join(chunks).encode())
+        report = import_items(self.seller, feed, "jsonl", sync=True)
+        self.assertEqual((report["unchanged"], report["updated"], report["failed"]), (5, 0, 0))
+
+    def test_order_lines_are_aggregated_in_order_and_per_seller(self):
+        other = make_seller()
+        buyer = User.objects.create_user(email="buyer@example.com", password="x")
+        address = OrderUser.objects.create(
+            user=buyer, phone_no="1", address="x", city="Pune"
+        )
+        order = Order.objects.create(
+            buyer_email=buyer.email, total_amount=Decimal("9.00"), order_user=address
+        )
+        lines = [
+            OrderItem.objects.create(
+                item_name=name,
+                price=Decimal("1.50"),
+                quantity=quantity,
+                seller=seller,
+                original_item=self.items[0],
+            )
+            for name, quantity, seller in [
+                ("Zucchini", 2, self.seller),
+                ("Apple", 1, other),
+                ("Mango", 3, self.seller),
+            ]
+        ]
+        # linked in reverse, so only the aggregate's ORDER BY gives id order
+        order.order_items.add(*reversed(lines))
+
+        def items_column(user):
+            content = "".join(self.export("orders", "csv", user))
+            return [row["items"] for row in csv.DictReader(io.StringIO(content))]
+
+        self.assertEqual(
+            items_column(buyer),
+            ["Zucchini x 2 @ 1.50; Apple x 1 @ 1.50; Mango x 3 @ 1.50"],
+        )
+        self.assertEqual(
+            items_column(self.seller.user), ["Zucchini x 2 @ 1.50; Mango x 3 @ 1.50"]
+        )
+
+    def test_buyers_cannot_export_items(self):
+        buyer = User.objects.create_user(email="buyer@example.com", password="x")
+
+        self.assertIsNone(export_response(EXPORTS["items"], buyer, "csv"))
+
+    async def test_asgi_requests_stream_through_an_async_iterator(self):
+        token = AccessToken.for_user(self.seller.user)
+
+        response = await self.async_client.get(
+            "/api/store/exports/items.csv",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+        self.assertEqual(len(rows), 5)
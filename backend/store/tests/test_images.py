@@ -0,0 +1,61 @@
+import io
+from unittest import mock
+
+from django.test import TestCase
+
+from store.bulk import import_items
+from store.images import variant_urls
+from store.models import Item
+from store.tests.helpers import make_item, make_seller
+
+OLD = "https://img.example.com/old.jpg"
+NEW = "https://img.example.com/new.jpg"
+VARIANTS = [{"thumb": "https://img.example.com/old-thumb.webp"}]
+
+
+@mock.patch("store.signals.schedule_item_variants")
+class ImageVariantInvalidationTests(TestCase):
+    def setUp(self):
+        self.seller = make_seller()
+        with mock.patch("store.signals.schedule_item_variants"):
+            item = make_item(self.seller, sku="PHOTO", image_urls=[OLD])
+        Item.objects.filter(pk=item.pk).update(image_variants=VARIANTS)
+        self.item = Item.objects.get(pk=item.pk)
+
+    def test_changing_image_urls_clears_variants_and_schedules_a_rebuild(self, schedule):
+        self.item.image_urls = [NEW]
+        self.item.save(update_fields=["image_urls"])
+
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.image_variants, [])
+        self.assertEqual(variant_urls(self.item, "thumb"), [NEW])
+        schedule.assert_called_once_with(self.item.pk, ())
+
+    def test_other_edits_keep_variants(self, schedule):
+        self.item.price = 99
+        self.item.save()
+
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.image_variants, VARIANTS)
+        schedule.assert_not_called()
+
+    def test_creating_an_item_with_images_schedules_variants(self, schedule):
+        item = make_item(self.seller, image_urls=[NEW])
+        schedule.assert_called_once_with(item.pk, ())
+
+    @mock.patch("store.bulk.schedule_item_variants")
+    def test_sync_clears_variants_only_when_images_change(self, bulk_schedule, schedule):
+        kept = make_item(self.seller, sku="SAME", item_name="Same", image_urls=[OLD])
+        Item.objects.filter(pk=kept.pk).update(image_variants=VARIANTS)
+        feed = (
+            "sku,item_name,item_type,manufacturer,quantity,price,image_urls\n"
+            f"PHOTO,Photo,grocery,Acme,10,10.00,{NEW}\n"
+            f"SAME,Same,grocery,Acme,10,12.00,{OLD}\n"
+        )
+        import_items(self.seller, io.BytesIO(feed.encode()), "csv", sync=True)
+
+        self.item.refresh_from_db()
+        kept.refresh_from_db()
+        self.assertEqual(self.item.image_variants, [])
+        self.assertEqual(kept.image_variants, VARIANTS)
+        bulk_schedule.assert_called_once_with(self.item.pk)
@@ -0,0 +1,13 @@
+from django.test import SimpleTestCase, override_settings
+
+
+class MetricsViewTests(SimpleTestCase):
+    @override_settings(METRICS_TOKEN="", DEBUG=True)
+    def test_not_served_without_a_token_even_with_debug(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_requires_the_bearer_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        wrong = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer nope")
+        self.assertEqual(wrong.status_code, 403)
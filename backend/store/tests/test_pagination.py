@@ -0,0 +1,111 @@
+import base64
+import json
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from store.models import Item
+from store.pagination import KeysetPagination
+from store.tests.helpers import make_item, make_seller
+
+
+def encode(position):
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seller = make_seller()
+        # prices repeat so pages have to break ties on the next sort keys
+        for index in range(12):
+            make_item(seller, price=Decimal(10 + index % 3), quantity=index % 4)
+
+    def paginate(self, queryset, cursor="", page_size=5):
+        request = Request(
+            APIRequestFactory().get(
+                "/items/", {"cursor": cursor, "page_size": page_size}
+            )
+        )
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(queryset, request)
+        return page, paginator
+
+    def walk(self, queryset, page_size=5):
+        """Ids of every page, following next links until the end."""
+        pages, cursor = [], ""
+        while True:
+            page, paginator = self.paginate(queryset, cursor, page_size)
+            pages.append([item.pk for item in page])
+            if paginator.next_position is None:
+                return pages
+            cursor = encode(paginator.next_position)
+
+    def test_cursor_round_trip_covers_every_row_once(self):
+        queryset = Item.objects.order_by("-created_at")
+        pages = self.walk(queryset)
+
+        self.assertEqual([len(page) for page in pages], [5, 5, 2])
+        flat = [pk for page in pages for pk in page]
+        self.assertEqual(flat, [item.pk for item in queryset.order_by("-created_at", "-id")])
+
+    def test_ties_on_the_sort_key_are_broken_by_id(self):
+        queryset = Item.objects.order_by("price")
+        flat = [pk for page in self.walk(queryset, page_size=2) for pk in page]
+
+        self.assertEqual(flat, list(queryset.order_by("price", "id").values_list("pk", flat=True)))
+
+    def test_mixed_direction_ordering(self):
+        queryset = Item.objects.order_by("price", "-quantity")
+        flat = [pk for page in self.walk(queryset, page_size=3) for pk in page]
+
+        expected = queryset.order_by("price", "-quantity", "-id").values_list("pk", flat=True)
+        self.assertEqual(flat, list(expected))
+
+    def test_seek_conditions_are_index_ranges(self):
+        same = KeysetPagination().seek_filter([("price", False), ("id", False)], [10, 3])
+        mixed = KeysetPagination().seek_filter(
+            [("price", True), ("quantity", False), ("id", False)], [10, 2, 3]
+        )
+
+        sql = str(Item.objects.filter(same).query)
+        self.assertIn('("store_item"."price", "store_item"."id") > (', sql)
+        # the leading key is bounded so the OR of ties is not a full scan
+        self.assertIn('"store_item"."price" <= 10', str(Item.objects.filter(mixed).query))
+
+    def test_item_listing_does_not_select_distinct(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/store/new-items/", {"sort": "price_asc", "cursor": ""})
+        listing = [query["sql"] for query in queries if 'FROM "store_item"' in query["sql"]]
+        self.assertTrue(listing)
+        self.assertNotIn("DISTINCT", listing[-1])
+
+    def test_malformed_cursors_are_not_found(self):
+        queryset = Item.objects.order_by("price")
+        cursors = [
+            "not base64!",
+            encode({"price": 1}),
+            encode([1]),
+            encode(["abc", 1]),
+            encode([None, 1]),
+            encode([[1], 1]),
+            encode(["10.00", {"id": 1}]),
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor), self.assertRaises(NotFound):
+                self.paginate(queryset, cursor)
+
+    def test_malformed_date_cursor_is_not_found(self):
+        with self.assertRaises(NotFound):
+            self.paginate(Item.objects.order_by("-created_at"), encode(["2024-13-45", 1]))
+
+    def test_malformed_cursor_is_a_404_response(self):
+        response = self.client.get(
+            "/api/store/new-items/", {"sort": "price_asc", "cursor": encode(["abc", 1])}
+        )
+        self.assertEqual(response.status_code, 404)
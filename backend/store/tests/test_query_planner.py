@@ -0,0 +1,129 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import serializers
+
+from store.models import Category, Item
+from store.query_planner import plan_query, plan_queryset
+from store.tests.helpers import make_item, make_seller
+
+
+class CategoryNameSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Category
+        fields = ["id", "name"]
+
+
+class ItemRowSerializer(serializers.ModelSerializer):
+    category = CategoryNameSerializer(read_only=True)
+    email = serializers.CharField(source="seller.user.email", read_only=True)
+    stock = serializers.SerializerMethodField()
+    field_dependencies = {"stock": ["quantity"]}
+
+    class Meta:
+        model = Item
+        fields = ["id", "item_name", "category", "email", "stock"]
+
+    def get_stock(self, obj):
+        return obj.quantity
+
+
+class ItemNameSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Item
+        fields = ["id", "item_name"]
+
+
+class CategoryWithItemsSerializer(serializers.ModelSerializer):
+    items = ItemNameSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Category
+        fields = ["id", "name", "items"]
+
+
+class WholeRowSerializer(serializers.ModelSerializer):
+    same_row = CategoryNameSerializer(source="*", read_only=True)
+
+    class Meta:
+        model = Category
+        fields = ["id", "same_row"]
+
+
+class UnhintedMethodSerializer(serializers.ModelSerializer):
+    stock = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Item
+        fields = ["id", "stock"]
+
+    def get_stock(self, obj):
+        return obj.quantity
+
+
+class QueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.fruit = Category.objects.create(name="Fruit")
+        cls.dairy = Category.objects.create(name="Dairy")
+        for index in range(6):
+            make_item(
+                make_seller(),
+                category=cls.fruit if index % 2 else cls.dairy,
+                quantity=index,
+            )
+
+    def render(self, serializer_class, queryset, count):
+        """Render ``count`` planned rows, asserting the queries do not grow with it."""
+        queryset = plan_queryset(queryset, serializer_class())
+        queries = 1 + len(plan_query(serializer_class(), queryset.model).prefetches)
+        with self.assertNumQueries(queries):
+            return serializer_class(list(queryset[:count]), many=True).data
+
+    def test_nested_serializers_and_dotted_sources_are_joined(self):
+        plan = plan_query(ItemRowSerializer(), Item)
+
+        self.assertEqual(plan.related, {"category", "seller", "seller__user"})
+        self.assertEqual(plan.prefetches, {})
+        self.assertIn("seller__user__email", plan.get_only())
+        self.assertNotIn("description", plan.get_only())
+
+        for count in (2, 6):
+            rows = self.render(ItemRowSerializer, Item.objects.order_by("id"), count)
+            self.assertEqual(len(rows), count)
+        self.assertEqual(set(rows[0]), {"id", "item_name", "category", "email", "stock"})
+
+    def test_method_fields_load_their_declared_columns(self):
+        self.assertIn("quantity", plan_query(ItemRowSerializer(), Item).get_only())
+        # without a hint the method may read anything: the row is loaded whole
+        self.assertIsNone(plan_query(UnhintedMethodSerializer(), Item).get_only())
+
+        rows = self.render(UnhintedMethodSerializer, Item.objects.order_by("id"), 6)
+        self.assertEqual([row["stock"] for row in rows], list(range(6)))
+
+    def test_source_star_loads_the_whole_row(self):
+        plan = plan_query(WholeRowSerializer(), Category)
+
+        self.assertIsNone(plan.get_only())
+        rows = self.render(WholeRowSerializer, Category.objects.order_by("id"), 2)
+        self.assertEqual(rows[0]["same_row"]["name"], "Fruit")
+
+    def test_reverse_relations_are_prefetched_once_per_level(self):
+        plan = plan_query(CategoryWithItemsSerializer(), Category)
+
+        self.assertEqual(set(plan.prefetches), {"items"})
+        # the foreign key is loaded so prefetched rows can be matched up
+        self.assertEqual(
+            plan.prefetches["items"].get_only(), {"id", "item_name", "category"}
+        )
+        categories = Category.objects.order_by("id")
+        rows = self.render(CategoryWithItemsSerializer, categories, 2)
+        self.assertEqual([len(row["items"]) for row in rows], [3, 3])
+
+    def test_listing_queries_do_not_grow_with_the_page(self):
+        cache.clear()
+        for page_size in (2, 6):
+            with self.assertNumQueries(1):
+                response = self.client.get(
+                    "/api/store/new-items/", {"cursor": "", "page_size": page_size}
+                )
+            self.assertEqual(len(response.json()["results"]), page_size)
@@ -0,0 +1,12 @@
+from django.test import TestCase
+
+EMPTY = {"items": [], "manufacturers": [], "categories": []}
+
+
+class AutocompleteTests(TestCase):
+    def test_short_and_empty_terms_get_empty_suggestions_without_querying(self):
+        for term in ["", "  ", "a", "ab"]:
+            with self.subTest(term=term), self.assertNumQueries(0):
+                response = self.client.get("/api/store/autocomplete/", {"q": term})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["suggestions"], EMPTY)
@@ -0,0 +1,74 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from store.models import Category
+from store.sparse_fields import get_request_field_spec, parse_field_spec
+from store.tests.helpers import make_item, make_seller
+
+
+class FieldSpecTests(TestCase):
+    def test_dotted_names_nest(self):
+        self.assertEqual(
+            parse_field_spec(" id, category.name,category.id ,,order_items"),
+            {"id": {}, "category": {"name": {}, "id": {}}, "order_items": {}},
+        )
+
+    def test_only_read_requests_are_pruned(self):
+        factory = APIRequestFactory()
+        read = Request(factory.get("/", {"fields": "id", "expand": "category"}))
+        write = Request(factory.post("/?fields=id"))
+
+        self.assertEqual(get_request_field_spec(read), ({"id": {}}, {"category": {}}))
+        self.assertIsNone(get_request_field_spec(write))
+        self.assertIsNone(get_request_field_spec(Request(factory.get("/"))))
+
+
+class SparseFieldsRequestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="Fruit")
+        for _ in range(4):
+            make_item(make_seller(), category=category)
+
+    def setUp(self):
+        # listings are response-cached; every test must render afresh
+        cache.clear()
+
+    def get(self, fields, **params):
+        with self.assertNumQueries(1) as queries:
+            response = self.client.get(
+                "/api/store/new-items/", {"cursor": "", "fields": fields, **params}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.sql = queries.captured_queries[0]["sql"]
+        return response.json()["results"]
+
+    def test_nested_names_select_nested_fields(self):
+        rows = self.get("id,category.name")
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]["category"], {"name": "Fruit"})
+        self.assertEqual(set(rows[0]), {"id", "category"})
+        # only the rendered columns are loaded
+        self.assertNotIn('"store_item"."description"', self.sql)
+
+    def test_unknown_names_are_ignored(self):
+        rows = self.get("id,bogus,category.bogus,category.name")
+
+        self.assertEqual(rows[0]["category"], {"name": "Fruit"})
+        self.assertEqual(set(rows[0]), {"id", "category"})
+
+    def test_relations_collapse_to_keys_unless_expanded(self):
+        category_id = Category.objects.get().pk
+
+        self.assertEqual(self.get("id,category")[0]["category"], category_id)
+        expanded = self.get("id,category", expand="category")[0]["category"]
+        self.assertEqual(expanded["id"], category_id)
+        self.assertEqual(expanded["name"], "Fruit")
+
+    def test_computed_fields_load_their_dependencies(self):
+        rows = self.get("is_in_stock,image")
+
+        self.assertEqual(rows[0], {"is_in_stock": True, "image": None})
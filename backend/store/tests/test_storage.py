@@ -0,0 +1,161 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.test import SimpleTestCase
+
+from store.storage import (
+    DjangoImageStorage,
+    ImageStorage,
+    StorageError,
+    SupabaseImageStorage,
+    upload_images,
+)
+
+PUBLIC = "https://project.supabase.co/storage/v1/object/public/images/"
+
+
+class ImageStorageTests(SimpleTestCase):
+    def test_incomplete_backends_fail_at_instantiation(self):
+        class Incomplete(ImageStorage):
+            def save(self, path, fileobj, content_type):
+                return path
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+class DjangoImageStorageTests(SimpleTestCase):
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        self.storage = DjangoImageStorage(FileSystemStorage(location=root, base_url="/media/"))
+
+    def test_round_trip(self):
+        url = self.storage.save("items/a.png", ContentFile(b"png!"), "image/png")
+
+        self.assertEqual(url, "/media/items/a.png")
+        path = self.storage.path_for_url(url)
+        self.assertEqual(path, "items/a.png")
+        self.assertEqual(self.storage.read(path), b"png!")
+        self.assertTrue(self.storage.exists(path))
+        self.assertEqual(self.storage.stat(path), {"size": 4, "content_type": None})
+        self.storage.delete([path])
+        self.assertFalse(self.storage.exists(path))
+        self.assertIsNone(self.storage.stat(path))
+
+    def test_foreign_urls_have_no_path(self):
+        self.assertIsNone(self.storage.path_for_url("https://elsewhere.example.com/a.png"))
+
+    def test_upload_urls_point_at_the_local_upload_view(self):
+        target = self.storage.create_upload_url("items/a.png", "image/png")
+
+        self.assertTrue(target["url"].startswith("/api/store/uploads/"))
+        self.assertEqual(target["method"], "PUT")
+        self.assertEqual(target["headers"], {"content-type": "image/png"})
+
+
+class SupabaseImageStorageTests(SimpleTestCase):
+    def setUp(self):
+        self.bucket = mock.Mock()
+        self.bucket.get_public_url.side_effect = lambda path: f"{PUBLIC}{path}?"
+        client = mock.Mock()
+        client.storage.from_.return_value = self.bucket
+        self.storage = SupabaseImageStorage(client, "images")
+
+    def test_in_memory_files_are_uploaded_as_bytes(self):
+        fileobj = SimpleUploadedFile("a.png", b"png!", content_type="image/png")
+        fileobj.read()
+
+        url = self.storage.save("items/a.png", fileobj, "image/png")
+
+        self.assertEqual(url, f"{PUBLIC}items/a.png?")
+        self.bucket.upload.assert_called_once_with(
+            "items/a.png", b"png!", {"content-type": "image/png", "upsert": "true"}
+        )
+
+    def test_temporary_files_are_streamed_and_closed(self):
+        fileobj = TemporaryUploadedFile("a.png", "image/png", 4, None)
+        fileobj.write(b"png!")
+        fileobj.flush()
+        self.addCleanup(fileobj.close)
+
+        self.storage.save("items/a.png", fileobj, "image/png")
+
+        body = self.bucket.upload.call_args.args[1]
+        self.assertEqual(body.name, fileobj.temporary_file_path())
+        self.assertTrue(body.closed)
+
+    def test_paths_come_from_public_urls_only(self):
+        self.assertEqual(self.storage.path_for_url(f"{PUBLIC}items/a.png?"), "items/a.png")
+        self.assertIsNone(self.storage.path_for_url("https://elsewhere.example.com/a.png"))
+
+    def test_stat_reads_either_info_shape_and_treats_errors_as_missing(self):
+        shapes = [
+            {"size": 4, "content_type": "image/png"},
+            [{"metadata": {"size": 4, "mimetype": "image/png"}}],
+        ]
+        for info in shapes:
+            with self.subTest(info=info):
+                self.bucket.info.return_value = info
+                self.assertEqual(
+                    self.storage.stat("items/a.png"), {"size": 4, "content_type": "image/png"}
+                )
+        self.bucket.info.side_effect = Exception("404")
+        self.assertIsNone(self.storage.stat("items/a.png"))
+        self.bucket.exists.side_effect = Exception("404")
+        self.assertFalse(self.storage.exists("items/a.png"))
+
+    def test_upload_urls_are_signed_by_supabase(self):
+        self.bucket.create_signed_upload_url.return_value = {"signed_url": "https://signed"}
+
+        target = self.storage.create_upload_url("items/a.png", "image/png")
+
+        self.assertEqual(
+            target,
+            {"url": "https://signed", "method": "PUT", "headers": {"content-type": "image/png"}},
+        )
+
+
+class UploadImagesTests(SimpleTestCase):
+    def setUp(self):
+        self.storage = mock.Mock()
+        self.storage.name = "fake"
+        self.storage.save.side_effect = self.save
+        patcher = mock.patch("store.storage.get_image_storage", return_value=self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def save(self, path, fileobj, content_type):
+        if fileobj.name.startswith("bad"):
+            raise OSError("refused")
+        return f"https://img.example.com/{path}"
+
+    def files(self, *names):
+        return [SimpleUploadedFile(name, b"x", content_type="image/png") for name in names]
+
+    def test_urls_keep_the_order_given(self):
+        urls = upload_images(self.files("a.PNG", "b.png", "c.png"))
+
+        paths = [call.args[0] for call in self.storage.save.call_args_list]
+        self.assertEqual(urls, [f"https://img.example.com/{path}" for path in paths])
+        self.assertTrue(all(path.startswith("items/") and path.endswith(".png") for path in paths))
+
+    def test_a_failed_upload_removes_the_others(self):
+        with self.assertRaisesMessage(StorageError, "bad.png: refused"):
+            upload_images(self.files("a.png", "bad.png", "c.png"))
+
+        saved = {
+            call.args[0]
+            for call in self.storage.save.call_args_list
+            if not call.args[1].name.startswith("bad")
+        }
+        self.storage.delete.assert_called_once()
+        self.assertEqual(set(self.storage.delete.call_args.args[0]), saved)
+
+    def test_nothing_is_uploaded_without_storage(self):
+        with mock.patch("store.storage.get_image_storage", return_value=None):
+            self.assertEqual(upload_images(self.files("a.png")), [])
@@ -0,0 +1,140 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from store.images import generate_item_variants
+from store.storage import DjangoImageStorage
+from store.tests.helpers import make_item, make_seller
+from store.uploads import complete_upload_session, create_upload_session
+
+
+def png_bytes():
+    out = io.BytesIO()
+    Image.new("RGB", (4, 4), "red").save(out, "PNG")
+    return out.getvalue()
+
+
+class UploadTestCase(TestCase):
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        self.storage = DjangoImageStorage(
+            FileSystemStorage(location=root, base_url="/media/")
+        )
+        patcher = mock.patch("store.uploads.get_image_storage", return_value=self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.item = make_item(make_seller())
+
+    def start(self, *content_types):
+        files = [{"name": f"f{i}", "content_type": ct} for i, ct in enumerate(content_types)]
+        session = create_upload_session(self.item, files)
+        return session["session"], [upload["path"] for upload in session["uploads"]]
+
+    def upload(self, path, body):
+        self.storage.storage.save(path, ContentFile(body))
+
+
+@mock.patch("store.signals.schedule_item_variants")
+class CompleteUploadSessionTests(UploadTestCase):
+
+    def test_valid_images_are_attached(self, schedule):
+        session, [path] = self.start("image/png")
+        self.upload(path, png_bytes())
+
+        added, missing, rejected = complete_upload_session(self.item, session)
+
+        self.assertEqual(added, [self.storage.url(path)])
+        self.assertEqual((missing, rejected), ([], []))
+
+    def test_files_stored_with_another_type_are_deleted(self, schedule):
+        session, [html, absent] = self.start("image/png", "image/png")
+        self.upload(html, b"<html><script>alert(1)</script></html>")
+        declared = {"size": 38, "content_type": "text/html"}
+
+        with mock.patch.object(self.storage, "stat", side_effect=[declared, None]):
+            added, missing, rejected = complete_upload_session(self.item, session)
+
+        self.assertEqual((added, missing, rejected), ([], [absent], [html]))
+        self.assertFalse(self.storage.exists(html))
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.image_urls, [])
+
+    def test_completion_only_reads_metadata_and_defers_the_byte_check(self, schedule):
+        session, [path] = self.start("image/jpeg")
+        self.upload(path, png_bytes())
+
+        with mock.patch.object(self.storage, "read") as read:
+            added, _, _ = complete_upload_session(self.item, session)
+
+        read.assert_not_called()
+        schedule.assert_called_once_with(self.item.pk, added)
+
+    @override_settings(IMAGE_UPLOAD_MAX_BYTES=10)
+    def test_oversized_files_are_deleted(self, schedule):
+        session, [path] = self.start("image/png")
+        self.upload(path, png_bytes())
+
+        added, missing, rejected = complete_upload_session(self.item, session)
+
+        self.assertEqual((added, rejected), ([], [path]))
+        self.assertFalse(self.storage.exists(path))
+
+
+class VerifyUploadedImagesTests(UploadTestCase):
+    def setUp(self):
+        super().setUp()
+        for patcher in (
+            mock.patch("store.images.get_image_storage", return_value=self.storage),
+            # the job's connection handling would close the test transaction
+            mock.patch("store.images.close_old_connections"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def complete(self, body, content_type="image/png"):
+        session, [path] = self.start(content_type)
+        self.upload(path, body)
+        with mock.patch("store.signals.schedule_item_variants") as schedule:
+            added, _, _ = complete_upload_session(self.item, session)
+        return path, schedule.call_args.args
+
+    def test_uploads_that_are_not_images_are_deleted_and_dropped(self):
+        html, job = self.complete(b"<html><script>alert(1)</script></html>")
+        png, _ = self.complete(png_bytes())
+        self.item.refresh_from_db()
+        urls = list(self.item.image_urls)
+
+        with self.assertLogs("store.images", "WARNING"):
+            with mock.patch("store.signals.schedule_item_variants") as reschedule:
+                generate_item_variants(*job)
+
+        self.assertFalse(self.storage.exists(html))
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.image_urls, [urls[1]])
+        reschedule.assert_called_once_with(self.item.pk, ())
+
+    def test_images_of_another_type_than_requested_are_rejected(self):
+        path, job = self.complete(png_bytes(), content_type="image/jpeg")
+
+        with self.assertLogs("store.images", "WARNING"):
+            generate_item_variants(*job)
+
+        self.assertFalse(self.storage.exists(path))
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.image_urls, [])
+
+    def test_verified_uploads_get_variants(self):
+        path, job = self.complete(png_bytes())
+
+        generate_item_variants(*job)
+
+        self.item.refresh_from_db()
+        self.assertEqual(len(self.item.image_variants), 1)
+        self.assertEqual(set(self.item.image_variants[0]), {"thumb", "card", "detail"})
@@ -0,0 +1,133 @@
+"""
+Direct-to-storage item image uploads.
+
+1. The seller asks for an upload session for an item and gets one signed
+   upload URL per file plus a signed session token (django.core.signing,
+   so nothing is stored server-side).
+2. The client uploads the bytes straight to storage.
+3. The client completes the session; the files that arrived within the
+   size limit and with the requested type are appended to Item.image_urls
+   and their variants are scheduled. Signed storage URLs enforce neither
+   size nor content type, so anything else is deleted, and the variants
+   job deletes files whose bytes turn out not to be such an image.
+
+The API only ever handles metadata, except with the "django" storage
+backend, whose stand-in upload URL points back at LocalUploadAPIView.
+"""
+
+import os
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+
+from backend.metrics import track_outbound
+from store.models import Item
+from store.storage import get_executor, get_image_storage, image_path
+
+UPLOAD_SESSION_SALT = "store.uploads.item-images"
+ALLOWED_IMAGE_TYPES = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+}
+MAX_FILES_PER_SESSION = 10
+UPLOADED, MISSING, REJECTED = "uploaded", "missing", "rejected"
+
+
+class UploadSessionError(Exception):
+    pass
+
+
+def session_max_age():
+    return getattr(settings, "IMAGE_UPLOAD_SESSION_MAX_AGE", 3600)
+
+
+def create_upload_session(item, files):
+    """
+    Signed upload URLs for ``files`` (``[{"name", "content_type"}]``,
+    already validated) and the token that completes them.
+    """
+    storage = get_image_storage()
+    if storage is None:
+        raise UploadSessionError("Image storage is not configured.")
+    uploads = []
+    for upload in files:
+        content_type = upload["content_type"]
+        path = image_path(f"upload{ALLOWED_IMAGE_TYPES[content_type]}")
+        with track_outbound(storage.name, "sign_upload"):
+            target = storage.create_upload_url(path, content_type)
+        uploads.append({"name": upload["name"], "path": path, **target})
+    session = signing.dumps(
+        {"item": item.pk, "paths": [upload["path"] for upload in uploads]},
+        salt=UPLOAD_SESSION_SALT,
+    )
+    return {"session": session, "expires_in": session_max_age(), "uploads": uploads}
+
+
+def complete_upload_session(item, session):
+    """
+    Attach the session's uploaded files to ``item``. Files that storage
+    reports as too large or of another type than requested are deleted.
+    Returns ``(added_urls, missing_paths, rejected_paths)``; completing
+    twice adds nothing new.
+    """
+    try:
+        data = signing.loads(session, salt=UPLOAD_SESSION_SALT, max_age=session_max_age())
+    except signing.SignatureExpired:
+        raise UploadSessionError("Upload session has expired.")
+    except signing.BadSignature:
+        raise UploadSessionError("Invalid upload session.")
+    if data["item"] != item.pk:
+        raise UploadSessionError("Upload session belongs to another item.")
+
+    storage = get_image_storage()
+    if storage is None:
+        raise UploadSessionError("Image storage is not configured.")
+
+    max_bytes = getattr(settings, "IMAGE_UPLOAD_MAX_BYTES", 10 * 1024 * 1024)
+
+    def check(path):
+        """
+        UPLOADED, MISSING or REJECTED by the size and type storage recorded;
+        the variants job checks the bytes themselves (see store.images).
+        """
+        with track_outbound(storage.name, "stat"):
+            stat = storage.stat(path)
+        if stat is None:
+            return MISSING
+        if stat["size"] is None or stat["size"] > max_bytes:
+            return REJECTED
+        declared = stat["content_type"]
+        extension = os.path.splitext(path)[1]
+        if declared is not None and ALLOWED_IMAGE_TYPES.get(declared) != extension:
+            return REJECTED
+        return UPLOADED
+
+    executor = get_executor("image-upload", getattr(settings, "IMAGE_UPLOAD_WORKERS", 4))
+    results = list(executor.map(check, data["paths"]))
+    by_result = {result: [] for result in (UPLOADED, MISSING, REJECTED)}
+    for path, result in zip(data["paths"], results):
+        by_result[result].append(path)
+    uploaded, missing, rejected = (
+        by_result[UPLOADED],
+        by_result[MISSING],
+        by_result[REJECTED],
+    )
+    if rejected:
+        # the bucket is public: never leave unchecked files behind
+        with track_outbound(storage.name, "delete"):
+            storage.delete(rejected)
+
+    with transaction.atomic():
+        item = Item.objects.select_for_update().get(pk=item.pk)
+        current = list(item.image_urls or [])
+        added = [storage.url(path) for path in uploaded]
+        added = [url for url in added if url not in current]
+        if added:
+            # saving clears the old variants and schedules new ones, which
+            # first checks that the added files really are images
+            item.image_urls = current + added
+            item._unverified_image_urls = added
+            item.save(update_fields=["image_urls", "updated_at"])
+    return added, missing, rejected
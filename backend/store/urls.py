@@ -11,6 +11,19 @@ urlpatterns = [
     path("categories/<int:pk>/breadcrumb/", CategoryBreadcrumbAPIView.as_view(), name="category-breadcrumb"),
     path("categories/<int:pk>/items/", CategoryItemsAPIView.as_view(), name="category-items"),
     path("items/", ItemListCreateAPIView.as_view(), name="item-list-create"),
+    path("items/import/", ItemImportAPIView.as_view(), name="item-import"),
+    path("items/bulk-update/", ItemBulkUpdateAPIView.as_view(), name="item-bulk-update"),
+    path(
+        "items/<int:pk>/uploads/",
+        ItemUploadSessionAPIView.as_view(),
+        name="item-upload-session",
+    ),
+    path(
+        "items/<int:pk>/uploads/complete/",
+        ItemUploadCompleteAPIView.as_view(),
+        name="item-upload-complete",
+    ),
+    path("uploads/<str:token>/", LocalUploadAPIView.as_view(), name="local-upload"),
     path("items/<int:pk>/", ItemRetrieveUpdateDestroyAPIView.as_view(), name="item-detail"),
     path("cart/", CartListCreateAPIView.as_view(), name="cart-list-create"),
     # OrderUser endpoints
@@ -44,12 +57,18 @@ urlpatterns = [
     ),
     path("checkout/", CheckoutAPIView.as_view(), name="checkout"),
     path("search-address/", SearchAddressAPIView.as_view(), name="search-address"),
+    path("autocomplete/", AutocompleteAPIView.as_view(), name="autocomplete"),
     # User order history
     path("user-orders/", UserOrderListAPIView.as_view(), name="user-orders"),
     # Seller orders
     path("seller-orders/", SellerOrderListAPIView.as_view(), name="seller-orders"),
     # Order update
     path("orders/<int:pk>/update/", OrderUpdateAPIView.as_view(), name="order-update"),
+    path(
+        "exports/<slug:dataset>.<slug:file_format>",
+        ExportAPIView.as_view(),
+        name="export",
+    ),
     path("saved-for-later/", SavedForLaterAPIView.as_view(), name="saved-for-later"),
     path("", include(router.urls)),
 ]
@@ -1,4 +1,7 @@
+import hashlib
+
 from django.shortcuts import render
+from django.conf import settings
 from accounts.models import User, Seller
 from store.models import Item, Category, Cart, CartItem, OrderUser, OrderItem, Order
 from store.serializers import (
@@ -10,19 +13,54 @@ from store.serializers import (
     OrderItemSerializer,
     OrderSerializer,
     SavedForLaterSerializer,
+    SellerItemSerializer,
+    ItemSummarySerializer,
+    ImageUploadSessionSerializer,
+    ImageUploadCompleteSerializer,
 )
 from rest_framework.views import APIView
 from rest_framework import status, response, permissions, serializers
 from rest_framework.response import Response
-from django.db.models import Q
+from django.db.models import Prefetch, Q, prefetch_related_objects
 from store.permissions import IsSellerOrReadOnly
+from store.cache import (
+    CATEGORY_TREE_VERSION,
+    ITEMS_VERSION,
+    ResponseCacheMixin,
+    category_items_version,
+    get_or_compute,
+    item_version,
+)
+from store.category_tree import get_category_tree
 from django.http import Http404
+from django.utils.http import parse_etags
 from rest_framework import generics
 from rest_framework import viewsets, permissions
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from .models import *
 from .serializers import ItemSerializer
-from rest_framework.filters import SearchFilter
+from store.filters import ItemSearchFilter, ItemSortFilter
+from store.search import AUTOCOMPLETE_MIN_LENGTH, autocomplete, no_suggestions
+from store.facets import compute_facets, facets_cache_key
+from store.pagination import ItemPagination
+from store.query_planner import QueryPlannerMixin
+from store.exports import EXPORTS, FORMATS as EXPORT_FORMATS, export_response
+from store.bulk import (
+    MAX_UPDATE_ROWS,
+    ImportFileError,
+    bulk_update_items,
+    detect_format,
+    import_items,
+)
+from store.storage import LOCAL_UPLOAD_SALT, DjangoImageStorage, get_image_storage
+from store.uploads import (
+    UploadSessionError,
+    complete_upload_session,
+    create_upload_session,
+)
+from django.core import signing
+from django.core.handlers.asgi import ASGIRequest
+from django.core.files import File
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework.generics import ListAPIView
@@ -36,9 +74,12 @@ class CategoryListCreateAPIView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request, format=None):
-        categories = Category.objects.filter(is_active=True)
-        serializer = CategorySerializer(categories, many=True)
-        return response.Response(serializer.data)
+        snapshot = get_category_tree()
+        headers = {"ETag": snapshot["etag"]}
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if snapshot["etag"] in if_none_match or "*" in if_none_match:
+            return response.Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return response.Response(snapshot["data"], headers=headers)
 
     def post(self, request, format=None):
         serializer = CategorySerializer(data=request.data)
@@ -48,104 +89,119 @@ class CategoryListCreateAPIView(APIView):
         return response.Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class CategoryDetailAPIView(generics.RetrieveAPIView):
+class CategoryDetailAPIView(
+    ResponseCacheMixin, QueryPlannerMixin, generics.RetrieveAPIView
+):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.AllowAny]
 
+    def get_cache_versions(self):
+        return [CATEGORY_TREE_VERSION]
+
 
-class CategoryBreadcrumbAPIView(generics.RetrieveAPIView):
+class CategoryBreadcrumbAPIView(QueryPlannerMixin, generics.RetrieveAPIView):
     queryset = Category.objects.all()
     serializer_class = CategoryBreadcrumbSerializer
     permission_classes = [permissions.AllowAny]
 
 
 # views for single category will be there as well
-class ItemListCreateAPIView(APIView):
+class ItemListCreateAPIView(QueryPlannerMixin, generics.ListCreateAPIView):
+    """
+    GET: paginated, compact catalog listing (a seller only sees their own items)
+    POST: create an item for the authenticated seller
+    """
+
     permission_classes = [permissions.AllowAny]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
+    pagination_class = ItemPagination
+    filter_backends = [DjangoFilterBackend, ItemSearchFilter, ItemSortFilter]
+    filterset_fields = ["category", "manufacturer", "item_type", "is_active"]
 
-    def get(self, request, format=None):
+    def get_queryset(self):
         user = self.request.user
         if user.is_authenticated and hasattr(user, "seller"):
             items = Item.objects.filter(seller=user.seller)
         else:
             items = Item.objects.all()
-        serializer = ItemSerializer(items, many=True, context={"request": request})
-        return Response(serializer.data)
-
-    def post(self, request, format=None):
-        serializer = ItemSerializer(data=request.data, context={"request": request})
-        if serializer.is_valid():
-            serializer.save(seller=request.user.seller)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        # GET loads only what SellerItemSerializer renders (QueryPlannerMixin)
+        return items
 
+    def get_serializer_class(self):
+        if self.request.method == "GET":
+            return SellerItemSerializer
+        return ItemSerializer
 
-class StandardPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = "page_size"
-    max_page_size = 100
+    def perform_create(self, serializer):
+        # ItemSerializer.create() attaches the requesting seller
+        serializer.save()
 
 
-class CategoryItemsAPIView(ListAPIView):
-    serializer_class = ItemSerializer
-    pagination_class = StandardPagination
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+class CategoryItemsAPIView(ResponseCacheMixin, QueryPlannerMixin, ListAPIView):
+    serializer_class = ItemSummarySerializer
+    pagination_class = ItemPagination
+    filter_backends = [DjangoFilterBackend, ItemSearchFilter, ItemSortFilter]
     filterset_fields = ["manufacturer", "item_type", "price"]
-    search_fields = ["item_name", "description", "manufacturer"]
 
     def get_queryset(self):
         category_id = self.kwargs["pk"]
         try:
-            category = Category.objects.get(pk=category_id)
+            category = Category.objects.only("path").get(pk=category_id)
         except Category.DoesNotExist:
             return Item.objects.none()
 
-        # Get all descendant categories recursively
-        def get_all_descendants(cat):
-            descendants = []
-            for sub in cat.subcategories.all():
-                descendants.append(sub)
-                descendants.extend(get_all_descendants(sub))
-            return descendants
-
-        all_categories = [category] + get_all_descendants(category)
-
-        # Include items in this category and all subcategories recursively
-        items = Item.objects.filter(category__in=all_categories)
-
-        # Handle sorting
-        sort_param = self.request.query_params.get("sort")
-        if sort_param:
-            if sort_param == "price_asc":
-                items = items.order_by("price")
-            elif sort_param == "price_desc":
-                items = items.order_by("-price")
-            elif sort_param in ["saving_desc", "percent_off_desc"]:
-                items = items.order_by("-price")  # Placeholder
-            else:
-                items = items.order_by("-created_at")
-        else:
-            items = items.order_by("-created_at")
+        # Include items in this category and all subcategories via the path index
+        # (search and sorting are applied by the filter backends)
+        return Item.objects.filter(category__path__startswith=category.path)
 
-        return items
+    def get_cache_versions(self):
+        return [category_items_version(self.kwargs["pk"]), CATEGORY_TREE_VERSION]
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        # ?facets=true adds sidebar counts for the current filter/search state
+        if self.request.query_params.get("facets") in ("1", "true"):
+            response.data["facets"] = self.get_facets()
+        return response
+
+    def get_facets(self):
+        key = facets_cache_key(
+            f"category:{self.kwargs['pk']}:{self.get_cache_version_token()}",
+            self.request.query_params,
+        )
+        return get_or_compute(
+            key,
+            lambda: compute_facets(self.filter_queryset(self.get_queryset())),
+            getattr(settings, "FACETS_CACHE_TIMEOUT", 60),
+            name="facets",
+        )
 
 
-class ItemViewSet(viewsets.ModelViewSet):
+class ItemViewSet(ResponseCacheMixin, QueryPlannerMixin, viewsets.ModelViewSet):
 
     permission_classes = [permissions.AllowAny]
     queryset = Item.objects.all()
     serializer_class = ItemSerializer
+    pagination_class = ItemPagination
 
     parser_classes = [MultiPartParser, FormParser, JSONParser]
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filter_backends = [DjangoFilterBackend, ItemSearchFilter, ItemSortFilter]
     filterset_fields = ["category", "manufacturer", "item_type", "price", "is_active"]
-    search_fields = ["item_name", "description", "manufacturer"]
 
     def get_serializer_context(self):
         return {"request": self.request}
 
+    def get_cache_versions(self):
+        if "pk" in self.kwargs:
+            return [item_version(self.kwargs["pk"]), CATEGORY_TREE_VERSION]
+        return [ITEMS_VERSION, CATEGORY_TREE_VERSION]
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return ItemSummarySerializer
+        return ItemSerializer
+
     def perform_create(self, serializer):
         seller = self.request.user.seller
         serializer.save()
@@ -167,36 +223,10 @@ class ItemViewSet(viewsets.ModelViewSet):
         if max_price:
             queryset = queryset.filter(price__lte=max_price)
 
-        # Sorting
-        sort_param = self.request.query_params.get("sort")
-        if sort_param:
-            if sort_param == "price_asc":
-                queryset = queryset.order_by("price")
-            elif sort_param == "price_desc":
-                queryset = queryset.order_by("-price")
-            elif sort_param == "saving_desc":
-                # Assuming there's a discount field or we calculate savings
-                queryset = queryset.order_by(
-                    "-price"
-                )  # Placeholder - adjust based on your model
-            elif sort_param == "saving_asc":
-                queryset = queryset.order_by(
-                    "price"
-                )  # Placeholder - adjust based on your model
-            elif sort_param == "percent_off_desc":
-                # Assuming there's a discount_percentage field
-                queryset = queryset.order_by(
-                    "-price"
-                )  # Placeholder - adjust based on your model
-            else:
-                # Default relevance sorting (by creation date or popularity)
-                queryset = (
-                    queryset.order_by("-created_at")
-                    if hasattr(Item, "created_at")
-                    else queryset
-                )
-
-        return queryset.distinct()
+        # search and sorting are applied by the filter backends; no DISTINCT:
+        # nothing here joins a to-many relation, and it would sort every
+        # matching row before the keyset LIMIT
+        return queryset
 
 
 class ItemRetrieveUpdateDestroyAPIView(APIView):
@@ -243,6 +273,230 @@ class ItemRetrieveUpdateDestroyAPIView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class ItemImportAPIView(APIView):
+    """
+    POST a CSV or JSON Lines catalog as ``file`` (multipart) to create many
+    items for the authenticated seller. ``format`` overrides the file
+    extension; ``dry_run=true`` only validates; ``sync=true`` treats the
+    file as the full catalog and applies only the difference (new,
+    changed and missing items). Returns a per-row report.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request, format=None):
+        if not hasattr(request.user, "seller"):
+            return Response(
+                {"detail": "Only sellers can import items."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"file": ["No file was submitted."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            fmt = request.data.get("format") or detect_format(upload.name)
+            report = import_items(
+                request.user.seller,
+                upload,
+                fmt,
+                dry_run=request.data.get("dry_run") in ("1", "true"),
+                sync=request.data.get("sync") in ("1", "true"),
+            )
+        except ImportFileError as e:
+            body = {"file": [str(e)]}
+            if e.report is not None:
+                # rows before the unreadable part were already imported
+                body["report"] = e.report
+            return Response(body, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report)
+
+
+class ItemBulkUpdateAPIView(APIView):
+    """
+    PATCH ``{"items": [{"id" | "sku", "price"?, "quantity"?}, ...]}`` to
+    change prices and stock of many of the seller's items at once.
+    Returns counts plus the rows that could not be applied.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [JSONParser]
+
+    def patch(self, request, format=None):
+        if not hasattr(request.user, "seller"):
+            return Response(
+                {"detail": "Only sellers can update items."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        rows = request.data.get("items") if isinstance(request.data, dict) else None
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {"items": ["Expected a non-empty list of items."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(rows) > MAX_UPDATE_ROWS:
+            return Response(
+                {"items": [f"At most {MAX_UPDATE_ROWS} items per request."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(bulk_update_items(request.user.seller, rows))
+
+
+class ExportAPIView(APIView):
+    """
+    GET /exports/<dataset>.<csv|ndjson> streams every row of ``items``,
+    ``orders`` or ``payments`` the user can see (see store.exports).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, dataset, file_format):
+        export = EXPORTS.get(dataset)
+        if export is None or file_format not in EXPORT_FORMATS:
+            raise Http404
+        response = export_response(
+            export,
+            request.user,
+            file_format,
+            asynchronous=isinstance(request._request, ASGIRequest),
+        )
+        if response is None:
+            return Response(
+                {"detail": f"You cannot export {dataset}."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        return response
+
+
+class SellerItemMixin:
+    """The requesting seller's item ``pk``, or 404 for anyone else."""
+
+    def get_item(self, request, pk):
+        seller = getattr(request.user, "seller", None)
+        item = Item.objects.filter(pk=pk, seller=seller).first() if seller else None
+        if item is None:
+            raise Http404
+        return item
+
+
+class ItemUploadSessionAPIView(SellerItemMixin, APIView):
+    """
+    POST ``{"files": [{"name", "content_type"}]}`` to get one signed upload
+    URL per image, to be uploaded to directly, and the session token that
+    ItemUploadCompleteAPIView takes afterwards.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, pk, format=None):
+        item = self.get_item(request, pk)
+        serializer = ImageUploadSessionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            session = create_upload_session(item, serializer.validated_data["files"])
+        except UploadSessionError as e:
+            return Response(
+                {"detail": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        return Response(session, status=status.HTTP_201_CREATED)
+
+
+class ItemUploadCompleteAPIView(SellerItemMixin, APIView):
+    """
+    POST ``{"session": token}`` once the uploads finished: the files that
+    reached storage and are valid images are appended to the item's
+    image_urls; invalid ones are deleted and listed as rejected.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, pk, format=None):
+        item = self.get_item(request, pk)
+        serializer = ImageUploadCompleteSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            added, missing, rejected = complete_upload_session(
+                item, serializer.validated_data["session"]
+            )
+        except UploadSessionError as e:
+            return Response({"session": [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+        item.refresh_from_db(fields=["image_urls"])
+        return Response(
+            {
+                "added": added,
+                "missing": missing,
+                "rejected": rejected,
+                "image_urls": item.image_urls,
+            }
+        )
+
+
+class LocalUploadAPIView(APIView):
+    """
+    Upload target for the "django" image storage backend, which cannot
+    presign URLs: PUT the raw file body to the signed URL from an upload
+    session. The signed token is the only credential.
+    """
+
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def put(self, request, token, format=None):
+        storage = get_image_storage()
+        if not isinstance(storage, DjangoImageStorage):
+            raise Http404
+        try:
+            target = signing.loads(
+                token,
+                salt=LOCAL_UPLOAD_SALT,
+                max_age=getattr(settings, "IMAGE_UPLOAD_SESSION_MAX_AGE", 3600),
+            )
+        except signing.BadSignature:
+            return Response(
+                {"detail": "Invalid or expired upload URL."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        if request.content_type != target["content_type"]:
+            return Response(
+                {"detail": f"Content-Type must be {target['content_type']}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            length = 0
+        max_bytes = getattr(settings, "IMAGE_UPLOAD_MAX_BYTES", 10 * 1024 * 1024)
+        if not 0 < length <= max_bytes:
+            return Response(
+                {"detail": f"File must be between 1 and {max_bytes} bytes."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if storage.exists(target["path"]):
+            return Response(
+                {"detail": "Already uploaded."}, status=status.HTTP_409_CONFLICT
+            )
+        # streamed to storage in chunks, never read into memory whole
+        storage.storage.save(target["path"], File(request.stream, name=target["path"]))
+        return Response(status=status.HTTP_201_CREATED)
+
+
+def with_cart_items(cart):
+    """Load the cart's items (with compact item data) in a single query."""
+    prefetch_related_objects(
+        [cart],
+        Prefetch(
+            "cart_items",
+            queryset=CartItem.objects.select_related("item__category", "item__seller"),
+        ),
+    )
+    return cart
+
+
 class CartListCreateAPIView(APIView):
     """
     GET: List all cart items for the authenticated user (not seller)
@@ -260,7 +514,7 @@ class CartListCreateAPIView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
         cart, _ = Cart.objects.get_or_create(user=user, seller=None)
-        serializer = CartSerializer(cart)
+        serializer = CartSerializer(with_cart_items(cart), context={"request": request})
         return Response(serializer.data)
 
     def post(self, request, format=None):
@@ -297,7 +551,7 @@ class CartListCreateAPIView(APIView):
                     )
                     cart_item.quantity = quantity
                     cart_item.save()
-                serializer = CartSerializer(cart)
+                serializer = CartSerializer(with_cart_items(cart), context={"request": request})
                 return Response(serializer.data, status=status.HTTP_200_OK)
             return Response(
                 {"detail": "No item_ids provided.", "received_data": request.data},
@@ -355,7 +609,7 @@ class CartListCreateAPIView(APIView):
             cart_item = CartItem.objects.get(cart=cart, item_id=item_id)
             cart_item.quantity = quantity
             cart_item.save()
-            serializer = CartSerializer(cart)
+            serializer = CartSerializer(with_cart_items(cart), context={"request": request})
             return Response(serializer.data, status=status.HTTP_200_OK)
         except CartItem.DoesNotExist:
             return Response(
@@ -368,7 +622,7 @@ class CartListCreateAPIView(APIView):
 
 
 # OrderUser CRUD
-class OrderUserListCreateAPIView(generics.ListCreateAPIView):
+class OrderUserListCreateAPIView(QueryPlannerMixin, generics.ListCreateAPIView):
     serializer_class = OrderUserSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -388,7 +642,7 @@ class OrderUserListCreateAPIView(generics.ListCreateAPIView):
         serializer.save(user=self.request.user)
 
 
-class OrderUserRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class OrderUserRetrieveUpdateDestroyAPIView(QueryPlannerMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = OrderUserSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -411,7 +665,7 @@ class OrderUserRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIVie
 # OrderItem CRUD
 
 
-class OrderItemListCreateAPIView(generics.ListCreateAPIView):
+class OrderItemListCreateAPIView(QueryPlannerMixin, generics.ListCreateAPIView):
     queryset = OrderItem.objects.all()
     serializer_class = OrderItemSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -428,7 +682,7 @@ class OrderItemListCreateAPIView(generics.ListCreateAPIView):
         serializer.save(seller=original_item.seller)
 
 
-class OrderItemRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class OrderItemRetrieveUpdateDestroyAPIView(QueryPlannerMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = OrderItem.objects.all()
     serializer_class = OrderItemSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -438,7 +692,7 @@ class OrderItemRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIVie
 
 
 # Order CRUD
-class OrderListCreateAPIView(generics.ListCreateAPIView):
+class OrderListCreateAPIView(QueryPlannerMixin, generics.ListCreateAPIView):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -447,7 +701,7 @@ class OrderListCreateAPIView(generics.ListCreateAPIView):
         return {"request": self.request}
 
 
-class OrderRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class OrderRetrieveUpdateDestroyAPIView(QueryPlannerMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -541,6 +795,36 @@ class CheckoutAPIView(APIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+class AutocompleteAPIView(APIView):
+    """
+    GET: typo-tolerant suggestions for the search box (?q=, optional ?limit=)
+    """
+
+    permission_classes = [permissions.AllowAny]
+    default_limit = 8
+    max_limit = 20
+
+    def get(self, request, format=None):
+        term = " ".join(request.query_params.get("q", "").lower().split())
+        if len(term) < AUTOCOMPLETE_MIN_LENGTH:
+            return Response({"query": term, "suggestions": no_suggestions()})
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+
+        # keystroke bursts for the same prefix are served from a short-lived cache
+        key = f"store:autocomplete:{limit}:{hashlib.sha1(term.encode()).hexdigest()}"
+        suggestions = get_or_compute(
+            key,
+            lambda: autocomplete(term, limit),
+            getattr(settings, "AUTOCOMPLETE_CACHE_TIMEOUT", 30),
+            name="autocomplete",
+        )
+        return Response({"query": term, "suggestions": suggestions})
+
+
 class SearchAddressAPIView(APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -562,7 +846,7 @@ class SearchAddressAPIView(APIView):
 
 
 # User Order History
-class UserOrderListAPIView(generics.ListAPIView):
+class UserOrderListAPIView(QueryPlannerMixin, generics.ListAPIView):
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -581,7 +865,7 @@ class UserOrderListAPIView(generics.ListAPIView):
 
 
 # Seller Order List
-class SellerOrderListAPIView(generics.ListAPIView):
+class SellerOrderListAPIView(QueryPlannerMixin, generics.ListAPIView):
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -601,7 +885,7 @@ class SellerOrderListAPIView(generics.ListAPIView):
 
 
 # Order Update (for admin/seller to update status and tracking)
-class OrderUpdateAPIView(generics.RetrieveUpdateAPIView):
+class OrderUpdateAPIView(QueryPlannerMixin, generics.RetrieveUpdateAPIView):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -647,8 +931,12 @@ class SavedForLaterAPIView(APIView):
                 {"detail": "Sellers cannot access saved for later."},
                 status=status.HTTP_403_FORBIDDEN,
             )
-        saved_items = SavedForLater.objects.filter(user=user)
-        serializer = SavedForLaterSerializer(saved_items, many=True)
+        saved_items = SavedForLater.objects.filter(user=user).select_related(
+            "item__category", "item__seller"
+        )
+        serializer = SavedForLaterSerializer(
+            saved_items, many=True, context={"request": request}
+        )
         return Response(serializer.data)
 
     def post(self, request, format=None):